@@ -18,8 +18,8 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
 
-    'cloudinary_storage',
-    'cloudinary',
+    # cloudinary_storage / cloudinary neeche CLOUDINARY section mein,
+    # sirf credentials set hon tab
 
     'rest_framework',
     'rest_framework_simplejwt',
@@ -29,8 +29,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'prompts_app.metrics.MetricsMiddleware',
+    'prompts_app.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'prompts_app.snapshots.SnapshotWhiteNoiseMiddleware',   # WhiteNoise + /snapshots/
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,6 +63,36 @@ TEMPLATES = [
 WSGI_APPLICATION = 'ai_prompt_hub.wsgi.application'
 
 
+# ============================
+# API-ONLY PROFILE — API_ONLY=True
+# ============================
+
+# Sirf JSON API serve karne wale workers ke liye: Django admin (HTML), sessions,
+# messages, CSRF aur clickjacking middleware hata do. Auth JWT se hota hai, isliye
+# DRF views ko in mein se kisi ki zaroorat nahi. Admin panel ke liye alag
+# process bina API_ONLY ke chalao (same DB). `manage.py startup_benchmark --compare`
+API_ONLY = config('API_ONLY', default=False, cast=bool)
+
+if API_ONLY:
+    _HTML_ONLY_APPS = {
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+    }
+    _HTML_ONLY_MIDDLEWARE = {
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',   # session chahiye; DRF khud authenticate karta hai
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    }
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in _HTML_ONLY_APPS]
+    MIDDLEWARE = [mw for mw in MIDDLEWARE if mw not in _HTML_ONLY_MIDDLEWARE]
+    TEMPLATES[0]['OPTIONS']['context_processors'] = [
+        'django.template.context_processors.request',
+    ]
+
+
 # ============================
 # DATABASE
 # ============================
@@ -80,6 +112,51 @@ else:
         }
     }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # SQLite production profile: WAL (readers writer ko block nahi karte),
+    # synchronous=NORMAL (WAL mein safe), bada page cache + mmap, aur lock pe
+    # turant error ki jagah `timeout` seconds tak wait (busy_timeout).
+    # IMMEDIATE: write transaction shuru mein hi lock le — beech mein upgrade
+    # pe "database is locked" nahi. (init_command / transaction_mode: Django 5.1+)
+    # WAL + synchronous=NORMAL production (DEBUG=False) mein default on.
+    # journal_mode=WAL file mein persist hota hai aur -wal/-shm files banata
+    # hai — local dev (DEBUG=True) pe off, taaki repo ka checked-in db.sqlite3
+    # har manage.py command se rewrite na ho. DEBUG=False se local chalaya to
+    # file WAL mein badal jaati hai: use commit mat karna (SQLITE_WAL=False se bacho).
+    SQLITE_WAL = config('SQLITE_WAL', default=not DEBUG, cast=bool)
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'init_command': (
+            ('PRAGMA journal_mode=WAL;PRAGMA synchronous=NORMAL;' if SQLITE_WAL else '') +
+            f"PRAGMA mmap_size={config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int)};"
+            f"PRAGMA cache_size=-{config('SQLITE_CACHE_KB', default=64 * 1024, cast=int)};"
+            'PRAGMA temp_store=MEMORY;'
+        ),
+        'timeout': config('SQLITE_BUSY_TIMEOUT', default=20, cast=int),
+        'transaction_mode': 'IMMEDIATE',
+    })
+
+# Usage increments / like toggles ek writer thread se batch mein (prompts_app/write_queue.py).
+# SQLite pe default on; Postgres pe inline.
+DB_WRITE_QUEUE = config(
+    'DB_WRITE_QUEUE',
+    default=DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3',
+    cast=bool,
+)
+WRITE_QUEUE_BATCH = config('WRITE_QUEUE_BATCH', default=200, cast=int)
+WRITE_QUEUE_LINGER = config('WRITE_QUEUE_LINGER', default=0.002, cast=float)    # batch jama karne ka max wait (s)
+WRITE_QUEUE_TIMEOUT = config('WRITE_QUEUE_TIMEOUT', default=30, cast=float)     # run() caller ka max wait (s)
+
+# Optional read replica — public GET endpoints (replica_reads = True) yahan se padhte hain
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default=None)
+# Device ke write ke baad itne seconds tak uske reads primary pe (replica lag se bada rakho)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(DATABASE_REPLICA_URL, conn_max_age=600)
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['prompts_app.db_router.ReplicaRouter']
+    MIDDLEWARE.append('prompts_app.db_router.ReplicaRoutingMiddleware')
+
 
 # ============================
 # CACHE — views.py ke liye zaroori
@@ -89,20 +166,113 @@ REDIS_URL = config('REDIS_URL', default=None)
 
 if REDIS_URL:
     # Production: Render/Railway pe Redis add karo, REDIS_URL env var set karo
-    CACHES = {
-        "default": {
-            "BACKEND": "django.core.cache.backends.redis.RedisCache",
-            "LOCATION": REDIS_URL,
-        }
+    L2_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+elif config('CACHE_SHARED_FILES', default=True, cast=bool):
+    # Redis nahi hai: gunicorn workers ke beech shared file cache, taaki admin
+    # invalidation sab workers tak pahunche. SharedFileCache add()/incr() ko
+    # flock se atomic karta hai (stampede / rollup locks, analytics segments) —
+    # sirf EK host ke workers ke liye; kai instances ho to REDIS_URL zaroori.
+    L2_CACHE = {
+        "BACKEND": "prompts_app.cache_backends.SharedFileCache",
+        "LOCATION": config('CACHE_DIR', default=os.path.join(BASE_DIR, '.cache')),
+        # Default 300 pe cull random files uda deta hai — analytics segments bhi
+        "OPTIONS": {"MAX_ENTRIES": config('CACHE_MAX_ENTRIES', default=10000, cast=int)},
     }
 else:
     # Local development: in-memory cache (server restart pe clear ho jata hai)
+    L2_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ai-prompt-hub-cache",
+    }
+
+if config('CACHE_TIERED', default=True, cast=bool):
+    # In-process LRU (L1) + upar wala backend (L2); see prompts_app/cache_backends.py
     CACHES = {
         "default": {
-            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-            "LOCATION": "ai-prompt-hub-cache",
-        }
+            "BACKEND": "prompts_app.cache_backends.TieredCache",
+            "LOCATION": "l2",
+            "OPTIONS": {
+                "L1_MAX_ENTRIES": config('CACHE_L1_MAX_ENTRIES', default=1000, cast=int),
+                "L1_TTL": config('CACHE_L1_TTL', default=5, cast=float),
+                # Locks aur analytics event segments hamesha shared L2 se
+                "L2_ONLY_SUFFIXES": (':lock', ':events'),
+            },
+        },
+        "l2": L2_CACHE,
     }
+else:
+    CACHES = {"default": L2_CACHE}
+
+# cache_utils.get_or_build (stampede protection / stale-while-revalidate)
+CACHE_STALE_TTL = config('CACHE_STALE_TTL', default=300, cast=int)     # soft expiry ke baad kitni der stale serve karein
+CACHE_LOCK_TTL = config('CACHE_LOCK_TTL', default=30, cast=int)        # rebuild lock ki max life
+CACHE_LOCK_WAIT = config('CACHE_LOCK_WAIT', default=2.0, cast=float)   # hard miss pe builder ka wait
+CACHE_SWR_BACKGROUND = config('CACHE_SWR_BACKGROUND', default=True, cast=bool)  # False = rebuild inline (tests)
+
+# Cache warmer (prompts_app/warmup.py, `manage.py warm_cache`, gunicorn.conf.py)
+CACHE_WARM_ON_BOOT = config('CACHE_WARM_ON_BOOT', default=False, cast=bool)
+CACHE_WARM_PAGES = config('CACHE_WARM_PAGES', default=2, cast=int)
+CACHE_WARM_WORKERS = config('CACHE_WARM_WORKERS', default=4, cast=int)
+CACHE_WARM_ON_WRITE = config('CACHE_WARM_ON_WRITE', default=False, cast=bool)   # invalidation ke baad pehle pages dobara
+
+# Post-write background queue (prompts_app/tasks.py): invalidation, snapshots, analytics flush
+BACKGROUND_WORKERS = config('BACKGROUND_WORKERS', default=2, cast=int)
+BACKGROUND_MAX_PENDING = config('BACKGROUND_MAX_PENDING', default=256, cast=int)   # isse zyada keys → inline
+BACKGROUND_COALESCE_DELAY = config('BACKGROUND_COALESCE_DELAY', default=0.05, cast=float)   # burst jama hone do (s)
+BACKGROUND_SYNC = config('BACKGROUND_SYNC', default=False, cast=bool)              # tests: sab inline
+BACKGROUND_DRAIN_TIMEOUT = config('BACKGROUND_DRAIN_TIMEOUT', default=20.0, cast=float)   # worker exit pe (< graceful_timeout)
+
+# In-process column catalogue (prompts_app/catalogue.py): feed pages ORM/cache ke bina
+CATALOGUE_ENABLED = config('CATALOGUE_ENABLED', default=False, cast=bool)
+CATALOGUE_REFRESH_INTERVAL = config('CATALOGUE_REFRESH_INTERVAL', default=2.0, cast=float)   # updated_at / tombstones
+CATALOGUE_COUNTER_INTERVAL = config('CATALOGUE_COUNTER_INTERVAL', default=60.0, cast=float)  # usage/like counters sweep
+
+# Typeahead index (prompts_app/suggest.py, /api/search/suggest/)
+SUGGEST_MAX_RESULTS = config('SUGGEST_MAX_RESULTS', default=20, cast=int)
+SUGGEST_VERSION_CHECK = config('SUGGEST_VERSION_CHECK', default=1.0, cast=float)   # shared version kitni der mein dekho (s)
+SUGGEST_MAX_AGE = config('SUGGEST_MAX_AGE', default=600, cast=int)                 # usage weights refresh (s)
+# True: gunicorn worker boot pe index (pehli keystroke fast); warna pehli suggest request pe
+SUGGEST_BUILD_ON_BOOT = config('SUGGEST_BUILD_ON_BOOT', default=False, cast=bool)
+
+# Near-duplicate detection (prompts_app/dedup.py): estimated Jaccard is se upar = duplicate
+DEDUP_THRESHOLD = config('DEDUP_THRESHOLD', default=0.8, cast=float)
+
+# View/like analytics (prompts_app/analytics.py): cache event stream → daily rollup tables
+ANALYTICS_ENABLED = config('ANALYTICS_ENABLED', default=True, cast=bool)
+ANALYTICS_FLUSH_INTERVAL = config('ANALYTICS_FLUSH_INTERVAL', default=30.0, cast=float)   # worker buffer → cache segment
+ANALYTICS_ROLLUP_INTERVAL = config('ANALYTICS_ROLLUP_INTERVAL', default=300, cast=int)    # segments → daily tables
+ANALYTICS_SEGMENT_TTL = config('ANALYTICS_SEGMENT_TTL', default=7 * 24 * 3600, cast=int)  # itne mein rollup na ho to events gaye
+ANALYTICS_STATS_TTL = config('ANALYTICS_STATS_TTL', default=60, cast=int)
+ANALYTICS_TOP_PROMPTS = config('ANALYTICS_TOP_PROMPTS', default=20, cast=int)
+
+
+# ============================
+# METRICS — /metrics/ (Prometheus)
+# ============================
+
+# Har gunicorn worker yahan apni file likhta hai, /metrics/ sab merge karta hai
+METRICS_DIR = config('METRICS_DIR', default=os.path.join(BASE_DIR, '.metrics'))
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=1.0, cast=float)
+# Scraper ke liye static token (Authorization: Token <METRICS_TOKEN>); JWT bhi chalta hai
+METRICS_TOKEN = config('METRICS_TOKEN', default=None)
+
+
+# ============================
+# PROFILING — opt-in cProfile sampling
+# ============================
+
+# False pe middleware load hi nahi hota (zero overhead)
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_VIEWS = config('PROFILING_VIEWS', default='PromptList', cast=lambda v: [s.strip() for s in v.split(',') if s.strip()])
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.01, cast=float)
+# `X-Profile: <PROFILING_TOKEN>` header wali request hamesha profile hogi
+PROFILING_TOKEN = config('PROFILING_TOKEN', default=None)
+PROFILING_DIR = config('PROFILING_DIR', default=os.path.join(BASE_DIR, '.profiles'))
+PROFILING_TOP_N = config('PROFILING_TOP_N', default=40, cast=int)
+PROFILING_RING_SIZE = config('PROFILING_RING_SIZE', default=50, cast=int)
 
 
 # ============================
@@ -123,7 +293,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'prompts_app.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -133,14 +303,41 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
+    # prompts_app/throttling.py — views ka throttle_scope; "N/period" = N tokens ki bucket
+    'DEFAULT_THROTTLE_RATES': {
+        'like': config('THROTTLE_LIKE_RATE', default='30/min'),
+        'favourite': config('THROTTLE_FAVOURITE_RATE', default='60/min'),
+        'search': config('THROTTLE_SEARCH_RATE', default='30/min'),
+        'ad_events': config('THROTTLE_AD_EVENTS_RATE', default='120/min'),
+    },
+    # IP bucket ke liye X-Forwarded-For ke aakhri itne hops trust karo (har proxy ek
+    # hop jodta hai). Default 1 = Render/Railway ka ek load balancer; seedha internet
+    # pe expose ho to 0 (REMOTE_ADDR). DRF ka None poora client header le leta hai —
+    # forged X-Forwarded-For se IP bucket bypass, isliye woh allowed nahi.
+    'NUM_PROXIES': config('NUM_PROXIES', default=1, cast=int),
 }
 
+if API_ONLY:
+    # Browsable API ko sessions/CSRF/templates chahiye
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ['rest_framework.renderers.JSONRenderer']
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=30),
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# Token-bucket throttles (prompts_app/throttling.py)
+THROTTLE_ENABLED = config('THROTTLE_ENABLED', default=True, cast=bool)
+# auto: Redis → shared file cache (ek host ke saare workers) → local. `local` pe
+# buckets per worker hain: asli limit = rate x gunicorn workers
+THROTTLE_BACKEND = config('THROTTLE_BACKEND', default='auto')          # auto | redis | file | local
+THROTTLE_IP_MULTIPLIER = config('THROTTLE_IP_MULTIPLIER', default=4, cast=int)   # IP bucket = device rate x yeh
+
+# CachedJWTAuthentication: user ko process mein itne seconds tak cache karo
+# (token version badle to turant reload — see prompts_app/authentication.py)
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=60, cast=int)
+
 
 # ============================
 # CORS
@@ -167,18 +364,49 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 
+# Pre-rendered feed snapshots (prompts_app/snapshots.py, `manage.py build_snapshots`)
+SNAPSHOTS_ENABLED = config('SNAPSHOTS_ENABLED', default=True, cast=bool)   # admin writes ke baad rebuild
+SNAPSHOT_ROOT = config('SNAPSHOT_ROOT', default=os.path.join(BASE_DIR, 'snapshots'))
+SNAPSHOT_URL_PREFIX = '/snapshots/'
+SNAPSHOT_PAGES = config('SNAPSHOT_PAGES', default=3, cast=int)
+SNAPSHOT_KEEP_VERSIONS = config('SNAPSHOT_KEEP_VERSIONS', default=3, cast=int)
+
+# Prompt thumbnails (prompts_app/images.py, `manage.py process_images`) — content-hash paths
+THUMBNAIL_ROOT = config('THUMBNAIL_ROOT', default=os.path.join(BASE_DIR, 'media', 'thumbs'))
+THUMBNAIL_URL_PREFIX = MEDIA_URL + 'thumbs/'
+THUMBNAIL_WIDTHS = config('THUMBNAIL_WIDTHS', default='160,320,640', cast=lambda v: [int(w) for w in v.split(',') if w.strip()])
+THUMBNAIL_WORKERS = config('THUMBNAIL_WORKERS', default=0, cast=int)          # 0 = CPU count
+THUMBNAIL_MAX_UPLOAD = config('THUMBNAIL_MAX_UPLOAD', default=10 * 1024 * 1024, cast=int)
+
 
 # ============================
 # CLOUDINARY — .env se lo, hardcode mat karo
 # ============================
 
-DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+# Code sirf image_url strings store karta hai, upload nahi karta — isliye
+# cloudinary apps tabhi load hote hain jab credentials set hon (bina unke
+# startup fail nahi hota, aur worker boot pe SDK import bhi nahi hota).
+CLOUDINARY_URL = config('CLOUDINARY_URL', default=None)
+CLOUDINARY_CLOUD_NAME = config('CLOUDINARY_CLOUD_NAME', default=None)
 
-CLOUDINARY_STORAGE = {
-    'CLOUD_NAME': config('CLOUDINARY_CLOUD_NAME'),
-    'API_KEY':    config('CLOUDINARY_API_KEY'),
-    'API_SECRET': config('CLOUDINARY_API_SECRET'),
-}
+if CLOUDINARY_URL or CLOUDINARY_CLOUD_NAME:
+    INSTALLED_APPS.insert(INSTALLED_APPS.index('rest_framework'), 'cloudinary_storage')
+    INSTALLED_APPS.insert(INSTALLED_APPS.index('rest_framework'), 'cloudinary')
+
+    STORAGES = {
+        'default': {'BACKEND': 'cloudinary_storage.storage.MediaCloudinaryStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    }
+
+    if CLOUDINARY_CLOUD_NAME:
+        CLOUDINARY_STORAGE = {
+            'CLOUD_NAME': CLOUDINARY_CLOUD_NAME,
+            'API_KEY':    config('CLOUDINARY_API_KEY'),
+            'API_SECRET': config('CLOUDINARY_API_SECRET'),
+        }
+    else:
+        # cloudinary_storage CLOUDINARY_URL env var khud padh leta hai
+        os.environ.setdefault('CLOUDINARY_URL', CLOUDINARY_URL)
 
 # ============================
 # MISC
@@ -1,5 +1,6 @@
 # ai_prompt_hub/urls.py
 
+from django.apps import apps
 from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
@@ -14,6 +15,8 @@ from rest_framework_simplejwt.views import (
 from django.core.management import call_command
 from django.contrib.auth.models import User
 
+from prompts_app.metrics import metrics_view
+
 
 # ======================
 # HEALTH ENDPOINT (PING)
@@ -61,8 +64,6 @@ def create_admin(request):
 # URL PATTERNS
 # =============
 urlpatterns = [
-    path('admin/', admin.site.urls),
-
     # Public & Admin APIs
     path('api/', include('prompts_app.urls')),
 
@@ -73,7 +74,14 @@ urlpatterns = [
     # Health check (Ping for Render)
     path('health/', health),
 
+    # Prometheus metrics (JWT ya METRICS_TOKEN chahiye)
+    path('metrics/', metrics_view),
+
     # TEMP Tools (Remove in production)
     path('run-migrations/', run_migrations),
     path('create-admin/', create_admin),
 ]
+
+# API_ONLY=True profile mein Django admin install hi nahi hota
+if apps.is_installed('django.contrib.admin'):
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
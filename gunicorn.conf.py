@@ -0,0 +1,55 @@
+# gunicorn.conf.py - gunicorn isse apne aap load karta hai (project root se chalao)
+
+
+def post_worker_init(worker):
+    from django.conf import settings
+
+    # CATALOGUE_ENABLED=True: in-memory catalogue pehli request se pehle load
+    if getattr(settings, 'CATALOGUE_ENABLED', False):
+        from prompts_app.catalogue import get_snapshot
+
+        snapshot = get_snapshot()
+        worker.log.info("Catalogue loaded: %d prompts", len(snapshot))
+
+    # SUGGEST_BUILD_ON_BOOT=True: typeahead index boot pe hi, pehli keystroke pe nahi
+    if getattr(settings, 'SUGGEST_BUILD_ON_BOOT', False):
+        from prompts_app.suggest import get_index
+
+        worker.log.info("Suggest index built: %d entries", len(get_index()))
+
+    # CACHE_WARM_ON_BOOT=True: worker traffic lene se pehle hot keys warm karta hai.
+    # Shared L2 (Redis / file cache) mein pehle se ho to sirf L1 bharta hai.
+    if not getattr(settings, 'CACHE_WARM_ON_BOOT', False):
+        return
+
+    from prompts_app.warmup import warm_cache
+
+    stats = warm_cache()
+    worker.log.info(
+        "Cache warmed: %d keys, %.1f KiB in %.2fs",
+        stats['keys'], stats['bytes'] / 1024, stats['seconds'],
+    )
+
+
+def worker_exit(server, worker):
+    # Commit ho chuke writes ka baaki kaam (invalidation, snapshots, analytics) khatam karke niklo
+    from prompts_app import tasks
+
+    if not tasks.drain():
+        worker.log.warning("Background queue not drained before exit")
+
+
+def child_exit(server, worker):
+    # Master mein: mare hue worker ki metrics file archive mein jodo (counters
+    # monotonic rahein, pid recycle pe purani file overwrite na ho)
+    import os
+
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ai_prompt_hub.settings')
+        django.setup()
+    from prompts_app.metrics import registry
+
+    registry.archive(worker.pid)
@@ -1,21 +1,93 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from django.utils.functional import cached_property
 from django.utils.html import format_html
-from .models import Category, Prompt, Favourite, PromptLike
+from .models import Category, Prompt, Favourite, PromptLike, Ad, AdmobConfig
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Postgres pe bina filter ke changelist ka COUNT(*) poori table scan karta hai.
+    Tab pg_class.reltuples ka estimate use karo (bade tables pe); filter lage
+    hon ya table chhoti ho to exact count.
+    """
+    EXACT_BELOW = 10000
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        connection = connections[self.object_list.db]
+        if connection.vendor == 'postgresql' and not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [self.object_list.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.EXACT_BELOW:
+                return row[0]
+        return super().count
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False   # "x of y selected" ke liye doosra COUNT nahi
+    list_per_page = 50
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'slug', 'order']
     prepopulated_fields = {'slug': ('name',)}
 
+
 @admin.register(Prompt)
-class PromptAdmin(admin.ModelAdmin):
+class PromptAdmin(ScalableAdmin):
     list_display = ['title', 'category', 'like_count', 'usage_count', 'image_preview', 'created_at']
+    list_select_related = ['category']
     list_filter = ['category', 'is_premium']
     search_fields = ['title', 'prompt_text']
     readonly_fields = ['like_count', 'usage_count', 'image_preview']
 
+    def get_search_results(self, request, queryset, search_term):
+        # Postgres: migration 0011 ka GIN full-text index (title + prompt_text).
+        # Baaki DBs pe Django ka default icontains search.
+        if search_term and connections[queryset.db].vendor == 'postgresql':
+            matches = RawSQL(
+                "to_tsvector('simple', prompts_app_prompt.title || ' ' || prompts_app_prompt.prompt_text) "
+                "@@ plainto_tsquery('simple', %s)",
+                [search_term],
+                output_field=BooleanField(),
+            )
+            return queryset.filter(matches), False
+        return super().get_search_results(request, queryset, search_term)
+
     def image_preview(self, obj):
-        if obj.image:
-            return format_html('<img src="{}" width="100" height="100" style="object-fit: cover; border-radius:8px;" />', obj.image.url)
+        if obj.image_url:
+            return format_html('<img src="{}" width="100" height="100" style="object-fit: cover; border-radius:8px;" loading="lazy" />', obj.image_url)
         return "No Image"
-    image_preview.short_description = "Preview"
\ No newline at end of file
+    image_preview.short_description = "Preview"
+
+
+@admin.register(Ad)
+class AdAdmin(ScalableAdmin):
+    list_display = ['title', 'ad_type', 'is_active', 'show_after_seconds', 'duration_days', 'image_preview', 'created_at']
+    list_filter = ['ad_type', 'is_active']
+    search_fields = ['title']
+    readonly_fields = ['image_preview']
+
+    def image_preview(self, obj):
+        if obj.image_url:
+            return format_html('<img src="{}" width="100" style="border-radius:8px;" loading="lazy" />', obj.image_url)
+        return "No Image"
+    image_preview.short_description = "Preview"
+
+
+@admin.register(AdmobConfig)
+class AdmobConfigAdmin(ScalableAdmin):
+    list_display = ['__str__', 'is_active', 'banner_android', 'banner_ios', 'updated_at']
+    list_filter = ['is_active']
+    readonly_fields = ['updated_at']
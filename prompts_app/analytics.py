@@ -0,0 +1,368 @@
+# prompts_app/analytics.py - Buffered view/like/ad event streams + daily rollups
+#
+# Request path pe koi DB write nahi:
+#   1. record_view()/record_like() process ke andar ek buffer mein jodte hain
+#      ((date, prompt, category) → [views, likes, unlikes])
+#   2. har ANALYTICS_FLUSH_INTERVAL seconds pe woh buffer shared cache mein ek
+#      naye "segment" ke roop mein append hota hai: `analytics:<n>:events`,
+#      n cache.add() se claim hota hai (head key sirf hint hai). Claim aur data
+#      ek hi atomic op hai — Redis pe SET NX, file cache pe SharedFileCache ka
+#      flock (cache_backends.py) — isliye do workers ek slot nahi le sakte aur
+#      segments kabhi overwrite nahi hote (append-only stream). Rolled-up
+#      (deleted) slots dobara claim nahi hote: writer floor key (cursor) ke
+#      upar se hi shuru karta hai.
+#   3. rollup() RollupCursor ke baad wale segments chunks mein padhta hai aur
+#      PromptDailyStats / CategoryDailyStats mein bulk upsert karta hai — cursor
+#      aur counts ek hi transaction mein, isliye dobara chalane pe double count
+#      nahi hota (idempotent) aur backlog chunk-by-chunk catch up hota hai.
+#
+# Ad impressions/clicks (/api/ads/events/) isi tarah alag `ads` stream mein
+# jaate hain → AdDailyStats.
+#
+# Flush aur rollup (har ANALYTICS_ROLLUP_INTERVAL mein kisi ek worker pe, cache
+# lock) background queue (prompts_app/tasks.py) pe; ya cron se
+# `manage.py rollup_analytics`.
+# `:events` keys TieredCache ke L1 mein nahi jaati (L2_ONLY_SUFFIXES).
+
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from . import tasks
+
+logger = logging.getLogger(__name__)
+
+STREAM = 'analytics'
+AD_STREAM = 'ads'
+SCAN_CHUNK = 500
+# Head ke baad itne khaali slots mil jaayein to stream khatam maan lo
+TAIL_PROBE = 50
+# Cursor ke theek peeche ke itne segments rakhe jaate hain (floor key na mile to
+# bhi stale head wala writer unka slot dobara na le le); usse purane rolled-up
+# segments delete. FileBasedCache expired files khud nahi hatata aur har set() pe
+# directory list karta hai.
+KEEP_PROCESSED = 100
+VIEW, LIKE, UNLIKE = 0, 1, 2
+IMPRESSION, CLICK = 0, 1
+
+
+def _enabled():
+    return getattr(settings, 'ANALYTICS_ENABLED', False)
+
+
+# ===================== SEGMENT STREAM (cache) =====================
+
+class EventStream:
+    """Append-only stream of count segments in the shared cache."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _key(self, n):
+        return f'{self.name}:{n}:events'
+
+    @property
+    def _head_key(self):
+        return f'{self.name}:head:events'
+
+    @property
+    def _floor_key(self):
+        return f'{self.name}:floor:events'
+
+    def append(self, counts):
+        # Cursor tak ke slots rollup ho chuke (aur shayad delete) — unme likha gaya
+        # segment kabhi padha nahi jaata, isliye floor ke upar se hi claim
+        hints = cache.get_many([self._head_key, self._floor_key])
+        n = max(hints.get(self._head_key) or 0, hints.get(self._floor_key) or 0) + 1
+        while not cache.add(self._key(n), counts, settings.ANALYTICS_SEGMENT_TTL):
+            n += 1
+        cache.set(self._head_key, n, None)
+        return n
+
+    def read(self, after, limit):
+        """[(n, counts)] of segments after `after`, at most `limit` slots scanned;
+        slots up to head that are missing (expired/culled) are returned as None."""
+        head = cache.get(self._head_key) or 0
+        found = []
+        start = after + 1
+        while len(found) < limit:
+            size = min(SCAN_CHUNK, limit - len(found))
+            keys = {self._key(n): n for n in range(start, start + size)}
+            values = cache.get_many(list(keys))
+            for key, n in keys.items():
+                if key in values or n <= head:
+                    found.append((n, values.get(key)))
+            if not values and start + size > head + TAIL_PROBE:
+                break
+            start += size
+        # Aakhri present segment ke baad ke khaali slots pe cursor aage mat badhao
+        while found and found[-1][1] is None:
+            found.pop()
+        return found
+
+    def discard(self, after, upto):
+        """Delete rolled-up segments in (after - KEEP_PROCESSED, upto - KEEP_PROCESSED]."""
+        cache.set(self._floor_key, upto, None)
+        start, end = max(after - KEEP_PROCESSED, 0) + 1, upto - KEEP_PROCESSED
+        if end >= start:
+            cache.delete_many([self._key(n) for n in range(start, end + 1)])
+
+
+class Buffer:
+    """Per-process {key: [counts...]} (`width` columns), periodically appended to an EventStream."""
+
+    def __init__(self, stream, width):
+        self.stream = stream
+        self.width = width
+        self.lock = threading.Lock()
+        self.counts = self._empty()
+        self.flushed_at = time.monotonic()
+
+    def _empty(self):
+        return defaultdict(lambda: [0] * self.width)
+
+    def add(self, key, column, n=1):
+        with self.lock:
+            self.counts[key][column] += n
+        if time.monotonic() - self.flushed_at >= settings.ANALYTICS_FLUSH_INTERVAL:
+            # Cache write request ke bahar, background queue pe (ek stream = ek key)
+            tasks.submit(f'{self.stream.name}:flush', self._flush_and_rollup, on_commit=False)
+
+    def _flush_and_rollup(self):
+        self.flush()
+        maybe_rollup()
+
+    def flush(self):
+        with self.lock:
+            counts, self.counts = dict(self.counts), self._empty()
+            self.flushed_at = time.monotonic()
+        if not counts:
+            return
+        try:
+            self.stream.append(counts)
+        except Exception:
+            logger.exception('%s flush of %d keys failed', self.stream.name, len(counts))
+
+
+stream = EventStream(STREAM)
+_buffer = Buffer(stream, 3)
+ad_stream = EventStream(AD_STREAM)
+_ad_buffer = Buffer(ad_stream, 2)
+atexit.register(_buffer.flush)
+atexit.register(_ad_buffer.flush)
+
+
+def record_view(prompt):
+    if _enabled():
+        _buffer.add((timezone.localdate().isoformat(), str(prompt.pk), str(prompt.category_id)), VIEW)
+
+
+def record_like(prompt, liked):
+    if _enabled():
+        _buffer.add((timezone.localdate().isoformat(), str(prompt.pk), str(prompt.category_id)), LIKE if liked else UNLIKE)
+
+
+def record_ad_events(events):
+    """[(ad_id, IMPRESSION | CLICK, n)] from the app; ad ids are checked at rollup time."""
+    if not _enabled():
+        return
+    day = timezone.localdate().isoformat()
+    for ad_id, column, n in events:
+        _ad_buffer.add((day, str(ad_id)), column, n)
+
+
+def flush():
+    _buffer.flush()
+    _ad_buffer.flush()
+
+
+# ===================== ROLLUP =====================
+
+def _upsert(model, key_field, fields, totals):
+    """Add {(date, key_id): [counts in `fields` order]} onto existing daily rows."""
+    if not totals:
+        return
+    dates = {d for d, _ in totals}
+    ids = {k for _, k in totals}
+    existing = {
+        (row['date'].isoformat(), str(row[f'{key_field}_id'])): row
+        for row in model.objects.filter(date__in=dates, **{f'{key_field}_id__in': ids})
+        .values('date', f'{key_field}_id', *fields)
+    }
+    rows = []
+    for (day, key_id), values in totals.items():
+        old = existing.get((day, key_id))
+        rows.append(model(
+            date=day, **{f'{key_field}_id': key_id},
+            **{f: (old[f] if old else 0) + v for f, v in zip(fields, values)},
+        ))
+    model.objects.bulk_create(
+        rows, batch_size=500, update_conflicts=True,
+        unique_fields=['date', key_field], update_fields=list(fields),
+    )
+
+
+def _sum_into(totals, key, values):
+    row = totals[key]
+    for i, v in enumerate(values):
+        row[i] += v
+
+
+def _live(model, ids):
+    return {str(pk) for pk in model.objects.filter(pk__in=ids).values_list('pk', flat=True)}
+
+
+def _apply_prompt_events(segments):
+    from .models import Category, CategoryDailyStats, Prompt, PromptDailyStats
+
+    per_prompt = defaultdict(lambda: [0, 0, 0])
+    per_category = defaultdict(lambda: [0, 0, 0])
+    for counts in segments:
+        for (day, prompt_id, category_id), values in counts.items():
+            _sum_into(per_prompt, (day, prompt_id), values)
+            _sum_into(per_category, (day, category_id), values)
+
+    # Beech mein delete hue prompts/categories ke counts chhod do (FK)
+    live_prompts = _live(Prompt, {p for _, p in per_prompt})
+    live_categories = _live(Category, {c for _, c in per_category})
+    fields = ('views', 'likes', 'unlikes')
+    _upsert(PromptDailyStats, 'prompt', fields, {k: v for k, v in per_prompt.items() if k[1] in live_prompts})
+    _upsert(CategoryDailyStats, 'category', fields, {k: v for k, v in per_category.items() if k[1] in live_categories})
+
+
+def _apply_ad_events(segments):
+    from .models import Ad, AdDailyStats
+
+    per_ad = defaultdict(lambda: [0, 0])
+    for counts in segments:
+        for key, values in counts.items():
+            _sum_into(per_ad, key, values)
+    # Public endpoint hai — anjaan/deleted ad ids yahin gir jaate hain
+    live_ads = _live(Ad, {a for _, a in per_ad})
+    _upsert(AdDailyStats, 'ad', ('impressions', 'clicks'), {k: v for k, v in per_ad.items() if k[1] in live_ads})
+
+
+ROLLUPS = (
+    (stream, _apply_prompt_events),
+    (ad_stream, _apply_ad_events),
+)
+
+
+def rollup_chunk(event_stream, apply, limit=SCAN_CHUNK * 4):
+    """Roll up the next `limit` segments of one stream; returns (segments read, segments lost)."""
+    from .models import RollupCursor
+
+    with transaction.atomic():
+        cursor, _ = RollupCursor.objects.select_for_update().get_or_create(name=event_stream.name)
+        previous = cursor.position
+        segments = event_stream.read(previous, limit)
+        if not segments:
+            return 0, 0
+        apply([counts for _, counts in segments if counts is not None])
+        cursor.position = segments[-1][0]
+        cursor.save()
+
+    event_stream.discard(previous, cursor.position)
+    lost = sum(1 for _, counts in segments if counts is None)
+    if lost:
+        logger.warning('%s rollup: %d segments expired before rollup', event_stream.name, lost)
+    return len(segments), lost
+
+
+def rollup(max_chunks=None):
+    """Catch up on every stream's backlog (or `max_chunks` chunks each). Returns (segments, lost)."""
+    total = lost = 0
+    for event_stream, apply in ROLLUPS:
+        chunks = 0
+        while max_chunks is None or chunks < max_chunks:
+            read, missing = rollup_chunk(event_stream, apply)
+            if not read:
+                break
+            total, lost, chunks = total + read, lost + missing, chunks + 1
+    return total, lost
+
+
+def maybe_rollup():
+    """At most once per ANALYTICS_ROLLUP_INTERVAL across workers, on the background queue."""
+    if cache.add(f'{STREAM}:rollup:lock', 1, settings.ANALYTICS_ROLLUP_INTERVAL):
+        tasks.submit(f'{STREAM}:rollup', rollup, on_commit=False)
+
+
+# ===================== STATS (rollups only) =====================
+
+def build_stats(days):
+    from django.db.models import Sum
+
+    from .models import CategoryDailyStats, PromptDailyStats, RollupCursor
+
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    sums = {'views': Sum('views'), 'likes': Sum('likes'), 'unlikes': Sum('unlikes')}
+
+    category_rows = CategoryDailyStats.objects.filter(date__gte=since)
+    daily = [
+        {'date': row['date'].isoformat(), 'views': row['views'], 'likes': row['likes'], 'unlikes': row['unlikes']}
+        for row in category_rows.values('date').annotate(**sums).order_by('date')
+    ]
+    categories = [
+        {'slug': row['category__slug'], 'name': row['category__name'],
+         'views': row['views'], 'likes': row['likes'], 'unlikes': row['unlikes']}
+        for row in category_rows.values('category__slug', 'category__name').annotate(**sums).order_by('-views')
+    ]
+    top_prompts = [
+        {'id': str(row['prompt_id']), 'title': row['prompt__title'],
+         'views': row['views'], 'likes': row['likes'], 'unlikes': row['unlikes']}
+        for row in PromptDailyStats.objects.filter(date__gte=since)
+        .values('prompt_id', 'prompt__title').annotate(**sums).order_by('-views')[:settings.ANALYTICS_TOP_PROMPTS]
+    ]
+    cursor = RollupCursor.objects.filter(name=STREAM).first()
+    return {
+        'from': since.isoformat(),
+        'to': today.isoformat(),
+        'totals': {
+            name: sum(d[name] for d in daily) for name in ('views', 'likes', 'unlikes')
+        },
+        'daily': daily,
+        'categories': categories,
+        'top_prompts': top_prompts,
+        'rolled_up_at': cursor.updated_at.isoformat() if cursor else None,
+    }
+
+
+def build_ad_stats(days):
+    from .models import Ad, AdDailyStats
+
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    daily = defaultdict(list)
+    totals = defaultdict(lambda: [0, 0])
+    rows = AdDailyStats.objects.filter(date__gte=since).order_by('date').values('ad_id', 'date', 'impressions', 'clicks')
+    for row in rows:
+        daily[row['ad_id']].append({'date': row['date'].isoformat(), 'impressions': row['impressions'], 'clicks': row['clicks']})
+        _sum_into(totals, row['ad_id'], (row['impressions'], row['clicks']))
+
+    ads = []
+    for ad in Ad.objects.order_by('-created_at'):
+        impressions, clicks = totals.get(ad.pk, (0, 0))
+        ads.append({
+            'id': str(ad.pk),
+            'title': ad.title,
+            'ad_type': ad.ad_type,
+            'is_active': ad.is_active,
+            'is_expired': ad.is_expired(),
+            'show_after_seconds': ad.show_after_seconds,
+            'duration_days': ad.duration_days,
+            'impressions': impressions,
+            'clicks': clicks,
+            'ctr': round(clicks / impressions, 4) if impressions else None,
+            'daily': daily.get(ad.pk, []),
+        })
+    return {'from': since.isoformat(), 'to': today.isoformat(), 'ads': ads}
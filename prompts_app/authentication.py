@@ -0,0 +1,75 @@
+# prompts_app/authentication.py - JWT auth with cached user resolution
+#
+# JWTAuthentication har request pe token verify karke User ki DB query chalata
+# hai. CachedJWTAuthentication signature verification waise hi karta hai, lekin
+# user ko process ke andar AUTH_USER_CACHE_TTL seconds tak yaad rakhta hai —
+# admin panel ke bursts mein repeat calls pe auth ki zero DB queries.
+#
+# Entry key (user id, token version) hai. Version shared cache mein rehta hai
+# (`auth_user_version:<id>`); bump_token_version() use delete karta hai to
+# sab workers ki entries agli request pe DB se dobara load hoti hain.
+# change_admin_credentials isi ko call karta hai.
+
+import copy
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+VERSION_KEY = 'auth_user_version:{}'
+
+_users = {}
+_users_lock = threading.Lock()
+
+
+def _token_version(user_id):
+    key = VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_token_version(user_id):
+    """Invalidate cached users for `user_id` in every worker."""
+    cache.delete(VERSION_KEY.format(user_id))
+    with _users_lock:
+        _users.pop(str(user_id), None)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)   # InvalidToken wahi raise karega
+
+        ttl = getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+        version = _token_version(user_id)
+        now = time.monotonic()
+
+        with _users_lock:
+            entry = _users.get(str(user_id))
+        if entry is not None and entry[0] > now and entry[1] == version:
+            user = entry[2]
+            if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        else:
+            user = super().get_user(validated_token)
+            if ttl > 0:
+                with _users_lock:
+                    _users[str(user_id)] = (now + ttl, version, user)
+
+        # Har request ko apni copy — views request.user mutate kar sakte hain
+        return copy.copy(user)
@@ -0,0 +1,336 @@
+# prompts_app/cache_backends.py - Two-tier cache (in-process L1 + shared L2)
+#
+# CACHES['default'] = TieredCache, jiska LOCATION doosre CACHES alias (L2) ka
+# naam hai (Redis, ya Redis na ho to SharedFileCache neeche). views.py pehle ki
+# tarah django.core.cache.cache use karta hai.
+#
+#   L1: har process mein bounded LRU (L1_MAX_ENTRIES), entries L1_TTL seconds
+#       tak — hot keys pe na network round trip, na unpickling.
+#       Values shared objects hain: caller unhe mutate na kare (copy karke badlo).
+#   L2: asli backend; add()/incr() jaise atomic ops seedha wahin jaate hain.
+#
+# Cross-worker invalidation, key family ke hisaab se (family = key ka ':' / '__'
+# se pehle ka hissa: 'prompt_detail:<id>' → prompt_detail, 'prompts_all__p2' →
+# prompts_all). delete() us family ka version token L2 mein badalta hai (ek
+# request mein kitne bhi deletes ho, request khatam hone par family ka ek hi
+# baar). Har process request ke pehle L1 access pe (request mein max ek baar)
+# apni L1 ki families ke versions ek get_many mein padhta hai; jo badli ho
+# sirf uski entries L1 se hatti hain — like pe feed/categories/ads ka L1 bacha
+# rehta hai. clear() global version badalta hai → poora L1.
+#
+# set() doosre workers ka L1 invalidate NAHI karta: overwrite ke baad woh
+# purani value max L1_TTL seconds tak de sakte hain. Jo write turant sab ko
+# dikhna chahiye woh delete() kare (views ke invalidation yahi karte hain).
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.signals import request_finished, request_started
+
+try:
+    import fcntl
+except ImportError:   # Windows dev box — wahan add()/incr() atomic nahi
+    fcntl = None
+
+VERSION_KEY = 'tiered:l1-version'
+FAMILY_VERSION_KEY = 'tiered:l1-version:{}'
+# SharedFileCache: MAX_ENTRIES cull ke liye directory listing process mein max itne seconds mein ek baar
+CULL_INTERVAL = 5.0
+# Request ke bahar (background threads, management commands) version itni der mein ek baar check
+OUT_OF_REQUEST_CHECK_INTERVAL = 1.0
+
+_l1_stores = {}
+_l1_stores_lock = threading.Lock()
+_state = threading.local()
+
+
+class _LRU:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.version = None
+        self.families = {}     # family → L2 version token jab L1 ne use dekha
+        self.checked_at = 0.0
+
+    def get(self, key):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None:
+                return None
+            expires = item[0]
+            if expires <= time.monotonic():
+                del self.data[key]
+                return None
+            self.data.move_to_end(key)
+            return item
+
+    def set(self, key, value, ttl, family):
+        with self.lock:
+            self.data[key] = (time.monotonic() + ttl, value, family)
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_entries:
+                self.data.popitem(last=False)
+
+    def pop(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def drop_family(self, family):
+        with self.lock:
+            for key in [key for key, item in self.data.items() if item[2] == family]:
+                del self.data[key]
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.families.clear()
+
+
+def _on_request_started(**kwargs):
+    _state.in_request = True
+    _state.checked = set()
+    _state.pending_bumps = set()
+
+
+def _on_request_finished(**kwargs):
+    pending = {}
+    for alias, family in getattr(_state, 'pending_bumps', ()):
+        pending.setdefault(alias, set()).add(family)
+    for alias, families in pending.items():
+        _bump_versions(alias, families)
+    _state.in_request = False
+    _state.pending_bumps = set()
+
+
+def _bump_versions(l2_alias, families):
+    token = uuid.uuid4().hex
+    caches[l2_alias].set_many({FAMILY_VERSION_KEY.format(family): token for family in families}, None)
+
+
+def _bump_global_version(l2_alias):
+    caches[l2_alias].set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def key_family(key):
+    return key.split(':', 1)[0].split('__', 1)[0]
+
+
+request_started.connect(_on_request_started, dispatch_uid='tiered_cache_request_started')
+request_finished.connect(_on_request_finished, dispatch_uid='tiered_cache_request_finished')
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.l2_alias = location
+        self.l1_ttl = float(options.get('L1_TTL', 5))
+        self.l2_only_suffixes = tuple(options.get('L2_ONLY_SUFFIXES', (':lock',)))
+        with _l1_stores_lock:
+            self._l1 = _l1_stores.setdefault(
+                location, _LRU(int(options.get('L1_MAX_ENTRIES', 1000)))
+            )
+
+    @property
+    def l2(self):
+        return caches[self.l2_alias]
+
+    def _l1_key(self, key, version):
+        return self.make_key(key, version=version)
+
+    def _cacheable(self, key):
+        return not key.endswith(self.l2_only_suffixes)
+
+    def _l1_ttl(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self.l1_ttl
+        return min(self.l1_ttl, timeout)
+
+    # ── version check (max ek baar per request) ─────────────────────────────
+
+    def _check_version(self):
+        if getattr(_state, 'in_request', False):
+            if self.l2_alias in _state.checked:
+                return
+            _state.checked.add(self.l2_alias)
+        elif time.monotonic() - self._l1.checked_at < OUT_OF_REQUEST_CHECK_INTERVAL:
+            return
+
+        families = list(self._l1.families)
+        keys = {FAMILY_VERSION_KEY.format(family): family for family in families}
+        current = self.l2.get_many([VERSION_KEY, *keys])
+        self._l1.checked_at = time.monotonic()
+        if current.get(VERSION_KEY) != self._l1.version:
+            self._l1.clear()
+            self._l1.version = current.get(VERSION_KEY)
+            return
+        for key, family in keys.items():
+            version = current.get(key)
+            if version != self._l1.families.get(family):
+                self._l1.drop_family(family)
+                self._l1.families[family] = version
+
+    def _track(self, keys):
+        # Family ka version L2 value padhne se PEHLE — beech ka delete miss na ho
+        new = {key_family(key) for key in keys} - self._l1.families.keys()
+        if new:
+            current = self.l2.get_many([FAMILY_VERSION_KEY.format(family) for family in new])
+            for family in new:
+                self._l1.families.setdefault(family, current.get(FAMILY_VERSION_KEY.format(family)))
+
+    def _l1_set(self, key, value, ttl, version):
+        self._l1.set(self._l1_key(key, version), value, ttl, key_family(key))
+
+    def _invalidate_other_workers(self, keys):
+        families = {key_family(key) for key in keys if self._cacheable(key)}
+        if not families:
+            return
+        if getattr(_state, 'in_request', False):
+            _state.pending_bumps.update((self.l2_alias, family) for family in families)
+        else:
+            _bump_versions(self.l2_alias, families)
+
+    # ── BaseCache API ───────────────────────────────────────────────────────
+
+    def get(self, key, default=None, version=None):
+        if not self._cacheable(key):
+            return self.l2.get(key, default, version=version)
+
+        self._check_version()
+        l1_key = self._l1_key(key, version)
+        item = self._l1.get(l1_key)
+        if item is not None:
+            return item[1]
+
+        self._track([key])
+        sentinel = object()
+        value = self.l2.get(key, sentinel, version=version)
+        if value is sentinel:
+            return default
+        self._l1_set(key, value, self.l1_ttl, version)
+        return value
+
+    def get_many(self, keys, version=None):
+        self._check_version()
+        found, missing = {}, []
+        for key in keys:
+            item = self._l1.get(self._l1_key(key, version)) if self._cacheable(key) else None
+            if item is not None:
+                found[key] = item[1]
+            else:
+                missing.append(key)
+        if missing:
+            self._track([key for key in missing if self._cacheable(key)])
+            fetched = self.l2.get_many(missing, version=version)
+            for key, value in fetched.items():
+                if self._cacheable(key):
+                    self._l1_set(key, value, self.l1_ttl, version)
+            found.update(fetched)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        if self._cacheable(key):
+            self._track([key])
+            self._l1_set(key, value, self._l1_ttl(timeout), version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout, version=version)
+        self._track([key for key in data if key not in failed and self._cacheable(key)])
+        for key, value in data.items():
+            if key not in failed and self._cacheable(key):
+                self._l1_set(key, value, self._l1_ttl(timeout), version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # Locks ke liye — atomicity sirf L2 de sakta hai
+        self._l1.pop(self._l1_key(key, version))
+        return self.l2.add(key, value, timeout, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version=version)
+
+    def has_key(self, key, version=None):
+        if self._cacheable(key):
+            self._check_version()
+            if self._l1.get(self._l1_key(key, version)) is not None:
+                return True
+        return self.l2.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._l1.pop(self._l1_key(key, version))
+        return self.l2.incr(key, delta, version=version)
+
+    def delete(self, key, version=None):
+        self._l1.pop(self._l1_key(key, version))
+        deleted = self.l2.delete(key, version=version)
+        self._invalidate_other_workers([key])
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        for key in keys:
+            self._l1.pop(self._l1_key(key, version))
+        self.l2.delete_many(keys, version=version)
+        self._invalidate_other_workers(keys)
+
+    def clear(self):
+        self._l1.clear()
+        self.l2.clear()
+        _bump_global_version(self.l2_alias)
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
+
+
+# ===== SHARED FILE CACHE (Redis ke bina L2) =====
+
+class SharedFileCache(FileBasedCache):
+    """FileBasedCache whose add()/incr() are atomic across processes on one host.
+
+    Django ka add() "has_key phir set" hai — do workers dono True paa sakte
+    hain, jo get_or_build ke ':lock' aur rollup lock tod deta hai. Yahan dono
+    ek directory-wide flock ke andar chalte hain. Kai hosts = Redis chahiye.
+
+    Django har set() pe MAX_ENTRIES check ke liye poori directory list karta
+    hai (hazaaron files pe ms); yahan woh cull CULL_INTERVAL mein ek baar.
+    """
+
+    _culled_at = 0.0
+
+    def _cull(self):
+        now = time.monotonic()
+        if now - self._culled_at < CULL_INTERVAL:
+            return
+        self._culled_at = now
+        super()._cull()
+
+    @contextmanager
+    def _atomic(self):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(os.path.join(self._dir, '.atomic.lock'), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)   # lock bhi chhoot jaata hai
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._atomic():
+            return super().add(key, value, timeout, version)
+
+    def incr(self, key, delta=1, version=None):
+        with self._atomic():
+            return super().incr(key, delta, version)
@@ -0,0 +1,160 @@
+# prompts_app/cache_utils.py - Stampede-safe cache helper
+#
+# get_or_build(key, build, ttl) ek envelope store karta hai:
+#     {'value': ..., 'soft': <soft expiry ts>, 'delta': <build time>}
+# aur use hard TTL (ttl + CACHE_STALE_TTL) ke saath cache mein rakhta hai.
+#
+#   - Soft expiry se pehle: XFetch-style probabilistic early refresh — jitna
+#     mehenga build, utna pehle refresh (sab workers ek saath expire nahi karte).
+#   - Soft expiry ke baad: stale value turant serve hoti hai, aur sirf wahi
+#     worker jo `<key>:lock` le paata hai background mein rebuild karta hai.
+#   - Hard miss (pehli baar / admin ne delete kiya): lock wala worker build
+#     karta hai, baaki CACHE_LOCK_WAIT tak uske result ka wait karte hain.
+#
+# build() hamesha primary se padhta hai (db_router.primary_reads) — shared
+# entry replica lag ka purana data na pakde.
+
+import logging
+import math
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from . import metrics
+from .db_router import primary_reads
+
+logger = logging.getLogger(__name__)
+
+LOCK_SUFFIX = ':lock'
+EARLY_REFRESH_BETA = 1.0
+POLL_INTERVAL = 0.05
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+ENVELOPE_KEYS = frozenset(('value', 'soft', 'delta'))
+
+
+def _envelope(cached):
+    """`cached` if it is a get_or_build envelope, else None (miss).
+
+    Deploy se pehle ke plain values (list / page dict) isi key pe pade ho sakte
+    hain — unhe miss maan ke rebuild, crash nahi."""
+    if isinstance(cached, dict) and cached.keys() == ENVELOPE_KEYS:
+        return cached
+    return None
+
+
+def _store(key, value, ttl, delta):
+    envelope = {'value': value, 'soft': time.time() + ttl, 'delta': delta}
+    cache.set(key, envelope, ttl + _setting('CACHE_STALE_TTL', ttl))
+
+
+def _build_and_store(key, build, ttl):
+    start = time.perf_counter()
+    with primary_reads():
+        value = build()
+    _store(key, value, ttl, time.perf_counter() - start)
+    return value
+
+
+def _acquire(key):
+    return cache.add(key + LOCK_SUFFIX, 1, _setting('CACHE_LOCK_TTL', 30))
+
+
+def _release(key):
+    cache.delete(key + LOCK_SUFFIX)
+
+
+def _should_refresh(envelope):
+    # XFetch: now - delta * beta * ln(rand) >= soft expiry
+    jitter = envelope['delta'] * EARLY_REFRESH_BETA * math.log(1.0 - random.random())
+    return time.time() - jitter >= envelope['soft']
+
+
+def _refresh_in_background(key, build, ttl):
+    def run():
+        try:
+            _build_and_store(key, build, ttl)
+        except Exception:
+            logger.exception('Background rebuild failed for %s', key)
+        finally:
+            _release(key)
+            connections.close_all()  # thread ke apne DB connections
+
+    if _setting('CACHE_SWR_BACKGROUND', True):
+        threading.Thread(target=run, name=f'cache-refresh:{key}', daemon=True).start()
+    else:
+        run()
+
+
+def get_or_build(key, build, ttl, family=None):
+    """Return the cached value for `key`, building it with `build()` at most once
+    across workers. `build` must not depend on per-device request state."""
+    envelope = _envelope(cache.get(key))
+
+    if envelope is not None:
+        if _should_refresh(envelope) and _acquire(key):
+            _refresh_in_background(key, build, ttl)
+            if family:
+                metrics.record_cache(family, 'stale')
+        elif family:
+            metrics.record_cache(family, True)
+        return envelope['value']
+
+    if family:
+        metrics.record_cache(family, False)
+
+    if not _acquire(key):
+        # Koi aur worker bana raha hai — thoda wait karo
+        deadline = time.monotonic() + _setting('CACHE_LOCK_WAIT', 2.0)
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            envelope = _envelope(cache.get(key))
+            if envelope is not None:
+                return envelope['value']
+        # Builder atak gaya — khud bana lo, lekin lock mat chhedo
+        return _build_and_store(key, build, ttl)
+
+    try:
+        return _build_and_store(key, build, ttl)
+    finally:
+        _release(key)
+
+
+def get_many_or_build(builds, ttl):
+    """Like get_or_build() for several keys with one cache round trip.
+    `builds` is {key: (build, family)}; returns {key: value}."""
+    envelopes = cache.get_many(list(builds))
+    values = {}
+    for key, (build, family) in builds.items():
+        envelope = _envelope(envelopes.get(key))
+        if envelope is None:
+            # Miss — lock/wait wala normal raasta
+            values[key] = get_or_build(key, build, ttl, family=family)
+            continue
+        if _should_refresh(envelope) and _acquire(key):
+            _refresh_in_background(key, build, ttl)
+            if family:
+                metrics.record_cache(family, 'stale')
+        elif family:
+            metrics.record_cache(family, True)
+        values[key] = envelope['value']
+    return values
+
+
+def warm(key, build, ttl, force=False):
+    """Populate `key` ahead of traffic (cache warmer). Returns the value; agar
+    shared L2 mein pehle se hai (doosre worker ne warm kiya) to sirf padh leta hai,
+    jo TieredCache ka L1 bhi bhar deta hai."""
+    if not force:
+        envelope = _envelope(cache.get(key))
+        if envelope is not None:
+            return envelope['value']
+    return _build_and_store(key, build, ttl)
@@ -0,0 +1,388 @@
+# prompts_app/catalogue.py - In-process column catalogue for feed pages
+#
+# CATALOGUE_ENABLED=True pe har worker feed ke liye zaroori prompt columns
+# memory mein compact arrays mein rakhta hai (ORM model instances / DRF nahi):
+#
+#   ids          bytearray, 16 bytes per prompt (UUID.bytes)
+#   category     array('H')  — categories list ka index
+#   created_us   array('q')  — created_at, epoch microseconds
+#   usage/likes  array('q')
+#   premium      bytearray
+#   title/image_url/tags  lists of str;  prompt_text alag string pool mein
+#   image        list of PromptImage dicts / None (thumbnails, size, placeholder)
+#
+# Har category (+ "all") ka created_at desc sorted row-index array hota hai;
+# PromptList ka page bas us array ka slice hai.
+#
+# Refresh: har CATALOGUE_REFRESH_INTERVAL seconds pe updated_at watermark se
+# badle rows + DeletionLog tombstones (indexed queries). LikeToggle/usage
+# .update() updated_at nahi chhoote, isliye counters (aur admin panel ke
+# deletes) CATALOGUE_COUNTER_INTERVAL pe ek pk/counter sweep se aate hain.
+# Har refresh naya immutable snapshot banata hai aur swap karta hai — readers
+# ko kabhi aadha update nahi dikhta. Refresh (counter sweep samet) background
+# thread pe; request hamesha maujooda snapshot turant leti hai — sirf boot ka
+# pehla load synchronous.
+
+import logging
+import threading
+import time
+import uuid
+from array import array
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from rest_framework.fields import DateTimeField
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    'id', 'title', 'prompt_text', 'image_url', 'category_id', 'tags',
+    'is_premium', 'usage_count', 'like_count', 'created_at', 'updated_at',
+    'image__width', 'image__height', 'image__placeholder', 'image__thumbnails',
+)
+# Jo commit updated_at ke baad late aaye unke liye watermark se itna peeche se padho
+REFRESH_LAG = timedelta(seconds=5)
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+_datetime_field = DateTimeField()
+
+
+def _to_us(dt):
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+
+def _from_us(us):
+    return EPOCH + timedelta(microseconds=us)
+
+
+def _image(data):
+    # PromptImageSerializer ka shape; LEFT JOIN mein image na ho to None
+    if data['image__width'] is None:
+        return None
+    return {
+        'width': data['image__width'],
+        'height': data['image__height'],
+        'placeholder': data['image__placeholder'],
+        'thumbnails': data['image__thumbnails'],
+    }
+
+
+class Snapshot:
+    """Immutable catalogue version; build new ones with `apply()`."""
+
+    def __init__(self):
+        self.categories = []          # [{'id', 'name', 'slug', 'order'}]
+        self.ids = bytearray()
+        self.category = array('H')
+        self.created_us = array('q')
+        self.usage = array('q')
+        self.likes = array('q')
+        self.premium = bytearray()
+        self.alive = bytearray()
+        self.title = []
+        self.image_url = []
+        self.image = []
+        self.tags = []
+        self.text_pool = []           # prompt_text, row index se
+        self.positions = {}           # UUID bytes → row
+        self.indexes = {}             # slug / 'all' → array('I') of rows
+        self.category_data = []       # per category index: serialized dict
+        self.dead = 0
+
+    def __len__(self):
+        return len(self.alive)
+
+    # ── build ───────────────────────────────────────────────────────────────
+
+    def _copy(self):
+        new = Snapshot()
+        new.ids = bytearray(self.ids)
+        new.category = array('H', self.category)
+        new.created_us = array('q', self.created_us)
+        new.usage = array('q', self.usage)
+        new.likes = array('q', self.likes)
+        new.premium = bytearray(self.premium)
+        new.alive = bytearray(self.alive)
+        new.title = list(self.title)
+        new.image_url = list(self.image_url)
+        new.image = list(self.image)
+        new.tags = list(self.tags)
+        new.text_pool = list(self.text_pool)
+        new.positions = dict(self.positions)
+        new.dead = self.dead
+        return new
+
+    def apply(self, categories=None, rows=(), deleted=(), counters=None):
+        """New snapshot with `categories` (full list), upserted `rows`
+        (dicts of COLUMNS), `deleted` prompt UUIDs and, optionally, a full
+        {UUID: (usage, likes)} sweep (prompts missing from it are dropped)."""
+        new = self._copy()
+        categories = self.categories if categories is None else categories
+        new.categories = categories
+        cat_index = {c['id']: i for i, c in enumerate(categories)}
+
+        if categories is not self.categories:
+            # Category list badli — purane indexes naye mein map karo
+            remap = {i: cat_index.get(c['id']) for i, c in enumerate(self.categories)}
+            for row, old in enumerate(new.category):
+                mapped = remap.get(old)
+                if mapped is None:
+                    new._kill(row)    # category delete ho gayi (cascade)
+                else:
+                    new.category[row] = mapped
+
+        for data in rows:
+            cat = cat_index.get(data['category_id'])
+            key = data['id'].bytes
+            row = new.positions.get(key)
+            if cat is None:
+                if row is not None:
+                    new._kill(row)
+                continue
+            if row is None:
+                row = len(new.alive)
+                new.positions[key] = row
+                new.ids += key
+                new.category.append(cat)
+                new.created_us.append(0)
+                new.usage.append(0)
+                new.likes.append(0)
+                new.premium.append(0)
+                new.alive.append(1)
+                new.title.append('')
+                new.image_url.append(None)
+                new.image.append(None)
+                new.tags.append('')
+                new.text_pool.append('')
+            elif not new.alive[row]:
+                new.alive[row] = 1
+                new.dead -= 1
+            new.category[row] = cat
+            new.created_us[row] = _to_us(data['created_at'])
+            new.usage[row] = data['usage_count']
+            new.likes[row] = data['like_count']
+            new.premium[row] = 1 if data['is_premium'] else 0
+            new.title[row] = data['title']
+            new.image_url[row] = data['image_url']
+            new.image[row] = _image(data)
+            new.tags[row] = data['tags']
+            new.text_pool[row] = data['prompt_text']
+
+        for pk in deleted:
+            row = new.positions.get(pk.bytes)
+            if row is not None:
+                new._kill(row)
+
+        if counters is not None:
+            for key, row in new.positions.items():
+                if not new.alive[row]:
+                    continue
+                values = counters.get(key)
+                if values is None:
+                    new._kill(row)
+                else:
+                    new.usage[row], new.likes[row] = values
+
+        if new.dead > len(new.alive) // 4:
+            new = new._compacted()
+        new._build_indexes()
+        return new
+
+    def _kill(self, row):
+        if self.alive[row]:
+            self.alive[row] = 0
+            self.dead += 1
+
+    def _compacted(self):
+        keep = [row for row in range(len(self.alive)) if self.alive[row]]
+        new = Snapshot()
+        new.categories = self.categories
+        for row in keep:
+            new.positions[bytes(self.ids[row * 16:row * 16 + 16])] = len(new.alive)
+            new.ids += self.ids[row * 16:row * 16 + 16]
+            new.alive.append(1)
+        new.category = array('H', (self.category[r] for r in keep))
+        new.created_us = array('q', (self.created_us[r] for r in keep))
+        new.usage = array('q', (self.usage[r] for r in keep))
+        new.likes = array('q', (self.likes[r] for r in keep))
+        new.premium = bytearray(self.premium[r] for r in keep)
+        new.title = [self.title[r] for r in keep]
+        new.image_url = [self.image_url[r] for r in keep]
+        new.image = [self.image[r] for r in keep]
+        new.tags = [self.tags[r] for r in keep]
+        new.text_pool = [self.text_pool[r] for r in keep]
+        return new
+
+    def _build_indexes(self):
+        created = self.created_us
+        rows = sorted(
+            (row for row in range(len(self.alive)) if self.alive[row]),
+            key=lambda row: -created[row],
+        )
+        per_category = [array('I') for _ in self.categories]
+        for row in rows:
+            per_category[self.category[row]].append(row)
+
+        self.indexes = {'all': array('I', rows)}
+        self.category_data = []
+        for i, c in enumerate(self.categories):
+            self.indexes[c['slug']] = per_category[i]
+            self.category_data.append({
+                'id': str(c['id']),
+                'name': c['name'],
+                'slug': c['slug'],
+                'order': c['order'],
+                'prompts_count': len(per_category[i]),
+            })
+
+    # ── read ────────────────────────────────────────────────────────────────
+
+    def serialize(self, row):
+        """Same shape as PromptSerializer output (is_liked=False)."""
+        category = self.category_data[self.category[row]]
+        created = timezone.localtime(_from_us(self.created_us[row]))
+        return {
+            'id': str(uuid.UUID(bytes=bytes(self.ids[row * 16:row * 16 + 16]))),
+            'title': self.title[row],
+            'prompt_text': self.text_pool[row],
+            'image_url': self.image_url[row],
+            'image': self.image[row],
+            'category_data': category,
+            'category_slug': category['slug'],
+            'tags': self.tags[row],
+            'is_premium': bool(self.premium[row]),
+            'usage_count': self.usage[row],
+            'like_count': self.likes[row],
+            'is_liked': False,
+            'created_at': _datetime_field.to_representation(created),
+        }
+
+    def feed(self, category):
+        return FeedView(self, self.indexes.get(category, array('I')))
+
+
+class FeedView:
+    """Sliceable, sized view over one sorted index — Django's Paginator isse
+    queryset ki tarah page kaat leta hai."""
+
+    def __init__(self, snapshot, index):
+        self.snapshot = snapshot
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    count = __len__
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.snapshot.serialize(row) for row in self.index[item]]
+        return self.snapshot.serialize(self.index[item])
+
+
+# ===================== LOADING / REFRESH =====================
+
+class Catalogue:
+    def __init__(self):
+        self.snapshot = None
+        self.watermark = None
+        self.last_deletion = 0
+        self.refreshed_at = 0.0
+        self.swept_at = 0.0
+        self.lock = threading.Lock()
+
+    def _categories(self):
+        from .models import Category
+        return list(Category.objects.order_by('order', 'name').values('id', 'name', 'slug', 'order'))
+
+    def load(self):
+        from .models import DeletionLog, Prompt
+
+        self.last_deletion = DeletionLog.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        rows = list(Prompt.objects.values(*COLUMNS).iterator(chunk_size=2000))
+        self.snapshot = Snapshot().apply(categories=self._categories(), rows=rows)
+        self.watermark = max((r['updated_at'] for r in rows), default=None)
+        self.refreshed_at = self.swept_at = time.monotonic()
+
+    def refresh(self):
+        from .models import DeletionLog, Prompt
+
+        rows = Prompt.objects.values(*COLUMNS)
+        if self.watermark is not None:
+            rows = rows.filter(updated_at__gte=self.watermark - REFRESH_LAG)
+        rows = list(rows)
+        tombstones = list(
+            DeletionLog.objects.filter(id__gt=self.last_deletion, kind='prompt')
+            .values_list('id', 'object_id')
+        )
+        categories = self._categories()
+        if categories == self.snapshot.categories:
+            categories = None
+
+        counters = None
+        now = time.monotonic()
+        if now - self.swept_at >= settings.CATALOGUE_COUNTER_INTERVAL:
+            counters = {
+                pk.bytes: (usage, likes)
+                for pk, usage, likes in Prompt.objects.values_list('pk', 'usage_count', 'like_count').iterator(chunk_size=5000)
+            }
+            self.swept_at = now
+
+        # Lag window ke rows har baar wapas aate hain — sirf asli badlav pe naya snapshot
+        changed = [r for r in rows if not self._unchanged(r)]
+        if changed or tombstones or categories is not None or counters is not None:
+            self.snapshot = self.snapshot.apply(
+                categories=categories, rows=changed,
+                deleted=[pk for _, pk in tombstones], counters=counters,
+            )
+        if rows:
+            self.watermark = max([r['updated_at'] for r in rows] + ([self.watermark] if self.watermark else []))
+        if tombstones:
+            self.last_deletion = max(i for i, _ in tombstones)
+        self.refreshed_at = now
+
+    def _unchanged(self, data):
+        snap = self.snapshot
+        row = snap.positions.get(data['id'].bytes)
+        return (
+            row is not None and snap.alive[row]
+            and snap.title[row] == data['title']
+            and snap.text_pool[row] == data['prompt_text']
+            and snap.image_url[row] == data['image_url']
+            and snap.image[row] == _image(data)
+            and snap.tags[row] == data['tags']
+            and snap.premium[row] == bool(data['is_premium'])
+            and snap.usage[row] == data['usage_count']
+            and snap.likes[row] == data['like_count']
+            and snap.created_us[row] == _to_us(data['created_at'])
+            and snap.categories[snap.category[row]]['id'] == data['category_id']
+        )
+
+    def get(self):
+        if self.snapshot is None:
+            with self.lock:
+                if self.snapshot is None:
+                    self.load()
+        elif time.monotonic() - self.refreshed_at >= settings.CATALOGUE_REFRESH_INTERVAL:
+            # Ek background thread refresh kare; sab requests purana snapshot serve karein
+            if self.lock.acquire(blocking=False):
+                threading.Thread(target=self._refresh_in_background, name='catalogue-refresh', daemon=True).start()
+        return self.snapshot
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception('Catalogue refresh failed')
+        finally:
+            self.lock.release()
+            connections.close_all()   # thread ke apne connections
+
+
+catalogue = Catalogue()
+
+
+def get_snapshot():
+    return catalogue.get()
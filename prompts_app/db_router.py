@@ -0,0 +1,81 @@
+# prompts_app/db_router.py - Read-replica routing for public GET endpoints
+#
+# DATABASE_REPLICA_URL set ho to settings 'replica' connection aur yeh router
+# add karta hai. Default sab kuch 'default' (primary) pe hi jaata hai; sirf
+# jin views pe `replica_reads = True` hai unke GET/HEAD reads replica pe jaate hain.
+#
+# Read-your-writes: LikeToggle / favourites jaise device writes ke baad
+# pin_to_primary(device_id) us device ko REPLICA_PIN_SECONDS tak primary pe
+# rakhta hai, taaki replica lag ki wajah se apna like/favourite gayab na dikhe.
+#
+# Shared cache bharne wale builders (cache_utils.get_or_build, batch detail
+# fill) primary_reads() ke andar chalte hain: admin write ke baad invalidated
+# key ko lagging replica ka purana data poore CACHE_TTL ke liye na mile.
+#
+# Local test: DATABASE_REPLICA_URL=sqlite:///replica.sqlite3 aur
+#   python manage.py migrate --database=replica
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+REPLICA_ALIAS = 'replica'
+PIN_KEY = 'replica_pin:{}'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def pin_to_primary(device_id):
+    if device_id and REPLICA_ALIAS in settings.DATABASES:
+        cache.set(PIN_KEY.format(device_id), 1, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(device_id):
+    return bool(device_id) and cache.get(PIN_KEY.format(device_id)) is not None
+
+
+@contextmanager
+def primary_reads():
+    """Route reads inside the block to the primary, even in a replica_reads view."""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return REPLICA_ALIAS if _use_replica.get() else None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Dono connections same data dekhte hain
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _use_replica.set(False)
+        try:
+            return self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+        if (
+            request.method in self.SAFE_METHODS
+            and getattr(view_class, 'replica_reads', False)
+            and not is_pinned(request.GET.get('device_id'))
+        ):
+            _use_replica.set(True)
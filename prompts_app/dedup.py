@@ -0,0 +1,169 @@
+# prompts_app/dedup.py - Near-duplicate prompts via MinHash + banded LSH
+#
+# prompt_text ke word 3-gram shingles ka NUM_PERM-value MinHash signature
+# (PromptSignature) aur BANDS bands (har band ROWS values) ka bucket hash
+# (PromptLSHBucket, index on band+bucket). Naye prompt ke candidates = jinka
+# kisi bhi band mein same bucket ho — ek indexed query, catalogue ke size se
+# independent. Candidates ko signature ki estimated Jaccard similarity se
+# DEDUP_THRESHOLD pe verify karte hain.
+#
+# 16 bands x 4 rows: ~0.5 Jaccard se upar wale pairs ka candidate banna
+# lagbhag tay, 0.8+ wale kabhi miss nahi hote (practically).
+#
+#   python manage.py find_duplicates --workers 4     # backfill + poore catalogue ke clusters
+
+import hashlib
+import random
+import re
+from array import array
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(1729)   # fixed seed: signatures processes/deploys ke beech stable
+_PERMS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+_token = re.compile(r'\w+')
+
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little')
+
+
+def shingles(text):
+    words = _token.findall(text.casefold())
+    if len(words) <= SHINGLE_WORDS:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(text):
+    """NUM_PERM-value signature as array('I'). Top-level so Pool workers can call it."""
+    hashes = [_hash64(s) for s in shingles(text)] or [0]
+    return array('I', (
+        min((a * h + b) % _MERSENNE for h in hashes) & _MAX_HASH
+        for a, b in _PERMS
+    ))
+
+
+def band_buckets(signature):
+    """[(band, bucket)] — bucket is a signed 64-bit hash of the band's values."""
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return buckets
+
+
+def similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def _load(blob):
+    signature = array('I')
+    signature.frombytes(bytes(blob))
+    return signature
+
+
+# ===================== CREATE / IMPORT TIME =====================
+
+def find_candidates(signatures, exclude=()):
+    """{key: signature} → {key: [(prompt_id, similarity)]} for existing prompts above
+    DEDUP_THRESHOLD, with one bucket query and one signature query for the whole batch."""
+    from .models import PromptLSHBucket, PromptSignature
+
+    buckets = {key: band_buckets(sig) for key, sig in signatures.items()}
+    wanted = defaultdict(set)
+    for pairs in buckets.values():
+        for band, bucket in pairs:
+            wanted[band].add(bucket)
+    if not wanted:
+        return {}
+
+    condition = Q()
+    for band, values in wanted.items():
+        condition |= Q(band=band, bucket__in=values)
+    members = defaultdict(set)
+    rows = PromptLSHBucket.objects.filter(condition).values_list('prompt_id', 'band', 'bucket')
+    for prompt_id, band, bucket in rows:
+        members[(band, bucket)].add(prompt_id)
+
+    candidate_ids = set().union(*members.values()) - set(exclude) if members else set()
+    stored = {
+        pk: _load(blob)
+        for pk, blob in PromptSignature.objects.filter(prompt_id__in=candidate_ids).values_list('prompt_id', 'minhash')
+    }
+
+    threshold = settings.DEDUP_THRESHOLD
+    results = {}
+    for key, sig in signatures.items():
+        ids = set().union(*(members.get(pair, ()) for pair in buckets[key])) & stored.keys()
+        matches = [(pk, similarity(sig, stored[pk])) for pk in ids]
+        results[key] = sorted(
+            [(pk, score) for pk, score in matches if score >= threshold],
+            key=lambda item: -item[1],
+        )
+    return results
+
+
+def index_prompts(prompts, signatures=None):
+    """(Re)write signatures + LSH buckets for saved prompts."""
+    from .models import PromptLSHBucket, PromptSignature
+
+    prompts = list(prompts)
+    if signatures is None:
+        signatures = {p.pk: minhash(p.prompt_text) for p in prompts}
+    with transaction.atomic():
+        PromptLSHBucket.objects.filter(prompt_id__in=signatures).delete()
+        PromptSignature.objects.filter(prompt_id__in=signatures).delete()
+        PromptSignature.objects.bulk_create(
+            [PromptSignature(prompt_id=pk, minhash=sig.tobytes()) for pk, sig in signatures.items()]
+        )
+        PromptLSHBucket.objects.bulk_create([
+            PromptLSHBucket(prompt_id=pk, band=band, bucket=bucket)
+            for pk, sig in signatures.items()
+            for band, bucket in band_buckets(sig)
+        ], batch_size=2000)
+
+
+def check_and_index(prompts):
+    """Index new prompts and return {prompt_id: [{id, title, similarity}]} of
+    near-duplicates among existing prompts and earlier prompts of the same batch."""
+    from .models import Prompt
+
+    prompts = list(prompts)
+    signatures = {p.pk: minhash(p.prompt_text) for p in prompts}
+    found = find_candidates(signatures, exclude=signatures)
+
+    # Isi batch ke andar ke duplicates (import mein aksar)
+    threshold = settings.DEDUP_THRESHOLD
+    seen_buckets = defaultdict(list)
+    for p in prompts:
+        sig = signatures[p.pk]
+        peers = {pk for pair in band_buckets(sig) for pk in seen_buckets[pair]}
+        found[p.pk] = found.get(p.pk, []) + [
+            (pk, score) for pk in peers
+            if (score := similarity(sig, signatures[pk])) >= threshold
+        ]
+        for pair in band_buckets(sig):
+            seen_buckets[pair].append(p.pk)
+
+    index_prompts(prompts, signatures)
+
+    titles = dict(Prompt.objects.filter(
+        pk__in={pk for matches in found.values() for pk, _ in matches}
+    ).values_list('pk', 'title'))
+    return {
+        pk: [{'id': str(other), 'title': titles.get(other, ''), 'similarity': round(score, 3)}
+             for other, score in matches]
+        for pk, matches in found.items() if matches
+    }
@@ -0,0 +1,41 @@
+# prompts_app/devices.py - device string → Device pk (cached)
+#
+# Likes/favourites ab Device ke integer pk se jude hain. View har request mein
+# device string ko ek baar resolve_device() se pk mein badalta hai aur aage
+# sirf pk use karta hai. Mapping kabhi nahi badalti, isliye lambi cache.
+
+import hashlib
+
+from django.core.cache import cache
+
+from .models import Device
+
+DEVICE_CACHE_TTL = 60 * 60 * 24
+
+
+def _cache_key(device_id):
+    # Device strings 255 chars tak ho sakte hain — key chhoti aur safe rakho
+    return 'device:' + hashlib.sha1(device_id.encode()).hexdigest()
+
+
+def resolve_device(device_id, create=False):
+    """Return the Device pk for `device_id`, or None if it isn't registered
+    (and `create` is False)."""
+    if not device_id:
+        return None
+
+    key = _cache_key(device_id)
+    pk = cache.get(key)
+    if pk is not None:
+        return pk
+
+    if create:
+        pk = Device.objects.get_or_create(device_id=device_id)[0].pk
+    else:
+        # Unknown devices negative-cache nahi hote: pehle like ke baad turant dikhna chahiye
+        pk = Device.objects.filter(device_id=device_id).values_list('pk', flat=True).first()
+        if pk is None:
+            return None
+
+    cache.set(key, pk, DEVICE_CACHE_TTL)
+    return pk
@@ -0,0 +1,116 @@
+# prompts_app/images.py - Thumbnail + image metadata pipeline (Pillow)
+#
+# Original image (local file ya admin upload) se:
+#   - THUMBNAIL_WIDTHS par resized WebP thumbnails
+#   - width/height (app layout shift se bache — aspect ratio pehle se pata)
+#   - ~16px wide blurred WebP placeholder, data URI
+# Files content hash se rakhi jaati hain:
+#
+#   THUMBNAIL_ROOT/<hash[:2]>/<hash>/<width>.webp   → THUMBNAIL_URL_PREFIX...
+#
+# Same image do prompts pe ho ya dobara process ho to kuch render nahi hota
+# (hash dedup). Files immutable hain; SnapshotWhiteNoiseMiddleware unhe
+# `immutable` cache headers ke saath serve karta hai.
+#
+#   python manage.py process_images prompts/ --workers 4
+
+import base64
+import hashlib
+import io
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageFilter, ImageOps, UnidentifiedImageError
+
+PLACEHOLDER_WIDTH = 16
+WEBP_QUALITY = 80
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _output_dir(digest):
+    return os.path.join(str(settings.THUMBNAIL_ROOT), digest[:2], digest)
+
+
+def _thumbnail_urls(digest, widths):
+    prefix = f'{settings.THUMBNAIL_URL_PREFIX}{digest[:2]}/{digest}/'
+    return {str(w): f'{prefix}{w}.webp' for w in widths}
+
+
+# Reject karne layak files: na-image, ya decompression bomb (MAX_IMAGE_PIXELS se
+# bahut bada — Error; thoda bada — Warning, jo warnings filter 'error' pe raise hoti hai)
+INVALID_IMAGE_ERRORS = (UnidentifiedImageError, Image.DecompressionBombError, Image.DecompressionBombWarning)
+
+
+def render(data):
+    """Process raw image bytes; returns the metadata dict stored on PromptImage.
+    Top-level and DB-free so it can run in a ProcessPoolExecutor."""
+    digest = content_hash(data)
+    with Image.open(io.BytesIO(data)) as original:
+        # Palette/L images ki transparency info mein hoti hai — RGB convert pe kaali ho jaati
+        alpha = 'A' in original.getbands() or 'transparency' in original.info
+        image = ImageOps.exif_transpose(original)
+        image = image.convert('RGBA' if alpha else 'RGB')
+    width, height = image.size
+
+    # Original se badi thumbnail nahi; sabse chhoti hamesha
+    widths = sorted({w for w in settings.THUMBNAIL_WIDTHS if w < width} or {min(width, min(settings.THUMBNAIL_WIDTHS))})
+
+    out_dir = _output_dir(digest)
+    os.makedirs(out_dir, exist_ok=True)
+    for w in widths:
+        path = os.path.join(out_dir, f'{w}.webp')
+        if os.path.exists(path):
+            continue
+        resized = image.resize((w, max(1, round(height * w / width))), Image.Resampling.LANCZOS)
+        resized.save(f'{path}.tmp', 'WEBP', quality=WEBP_QUALITY, method=6)
+        os.replace(f'{path}.tmp', path)
+
+    tiny = image.resize(
+        (PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))),
+        Image.Resampling.BILINEAR,
+    ).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    tiny.save(buffer, 'WEBP', quality=40)
+
+    return {
+        'source_hash': digest,
+        'width': width,
+        'height': height,
+        'placeholder': 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode(),
+        'thumbnails': _thumbnail_urls(digest, widths),
+    }
+
+
+def existing_metadata(digest):
+    """Metadata of an already processed image with this content hash, if its files still exist."""
+    from .models import PromptImage
+
+    known = PromptImage.objects.filter(source_hash=digest).values(
+        'source_hash', 'width', 'height', 'placeholder', 'thumbnails'
+    ).first()
+    if known and os.path.isdir(_output_dir(digest)):
+        return known
+    return None
+
+
+def attach(prompt_ids_to_metadata):
+    """Save {prompt_id: metadata} and bump the prompts' updated_at, so delta sync
+    and the catalogue see the new image fields."""
+    from .models import Prompt, PromptImage
+
+    with transaction.atomic():
+        for prompt_id, metadata in prompt_ids_to_metadata.items():
+            PromptImage.objects.update_or_create(prompt_id=prompt_id, defaults=metadata)
+        Prompt.objects.filter(pk__in=list(prompt_ids_to_metadata)).update(updated_at=timezone.now())
+
+
+def process_upload(prompt, data):
+    """Admin upload: process (or reuse by hash) and attach to `prompt`."""
+    metadata = existing_metadata(content_hash(data)) or render(data)
+    attach({prompt.pk: metadata})
+    return metadata
@@ -0,0 +1,53 @@
+# prompts_app/management/commands/auth_benchmark.py
+#
+# Plain JWTAuthentication vs CachedJWTAuthentication: per-request time aur DB
+# queries, ek hi access token ke saath repeat calls pe.
+#
+#   python manage.py auth_benchmark --username admin --requests 500
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from prompts_app.authentication import CachedJWTAuthentication
+
+
+class Command(BaseCommand):
+    help = "Benchmark JWT authentication with and without the cached user lookup"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', help='User to mint a token for (default: first superuser)')
+        parser.add_argument('--requests', type=int, default=500)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = User.objects.filter(is_active=True)
+        user = (
+            users.filter(username=options['username']).first() if options['username']
+            else users.filter(is_superuser=True).first()
+        )
+        if user is None:
+            raise CommandError('No matching active user')
+
+        header = f'Bearer {AccessToken.for_user(user)}'
+        request = APIRequestFactory().get('/api/admin/stats/', HTTP_AUTHORIZATION=header)
+        n = options['requests']
+
+        for label, backend in (('JWTAuthentication', JWTAuthentication()),
+                               ('CachedJWTAuthentication', CachedJWTAuthentication())):
+            backend.authenticate(request)   # warm-up (cache fill)
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                for _ in range(n):
+                    backend.authenticate(request)
+                elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{label:<24} {elapsed / n * 1e6:8.1f} us/request  "
+                f"{len(queries) / n:.2f} queries/request"
+            )
@@ -0,0 +1,24 @@
+# prompts_app/management/commands/build_snapshots.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from prompts_app.snapshots import build_snapshots
+
+
+class Command(BaseCommand):
+    help = "Render static JSON snapshots (categories, ads, AdMob config, first N feed pages)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=None,
+                            help='Feed pages per category (default: SNAPSHOT_PAGES)')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        manifest, total_bytes = build_snapshots(pages=options['pages'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot v{manifest['version']}: {len(manifest['files'])} files, "
+            f"{total_bytes / 1024:.1f} KiB in {elapsed:.2f}s → {manifest['base_url']}"
+        ))
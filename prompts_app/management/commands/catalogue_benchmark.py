@@ -0,0 +1,97 @@
+# prompts_app/management/commands/catalogue_benchmark.py
+#
+# In-memory catalogue vs ORM feed path:
+#   - --synthetic N prompts ka catalogue bana ke retained memory (tracemalloc)
+#   - feed page latency: catalogue slice vs build_feed_page() ORM + DRF (current DB)
+#
+#   python manage.py catalogue_benchmark --synthetic 100000
+
+import gc
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from prompts_app import views
+from prompts_app.catalogue import Snapshot
+
+
+def _synthetic_rows(n, categories):
+    now = timezone.now()
+    for i in range(n):
+        yield {
+            'id': uuid.uuid4(),
+            'title': f'Synthetic prompt {i}',
+            'prompt_text': f'Write a detailed description of scene {i}. ' * 8,
+            'image_url': f'https://res.cloudinary.com/demo/image/upload/v1/prompts/{i}.jpg',
+            'category_id': categories[i % len(categories)]['id'],
+            'tags': 'portrait,cinematic',
+            'is_premium': i % 10 == 0,
+            'usage_count': i,
+            'like_count': i % 97,
+            'created_at': now - timedelta(seconds=i),
+            'updated_at': now,
+        }
+
+
+def _timeit(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+class Command(BaseCommand):
+    help = "Benchmark the in-memory catalogue (memory per N prompts, page latency) against the ORM path"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--synthetic', type=int, default=100000)
+        parser.add_argument('--runs', type=int, default=50)
+
+    def handle(self, *args, **options):
+        n, runs = options['synthetic'], options['runs']
+        page_size = views.PromptPagination.page_size
+        categories = [
+            {'id': uuid.uuid4(), 'name': f'Category {i}', 'slug': f'cat-{i}', 'order': i}
+            for i in range(20)
+        ]
+
+        gc.collect()
+        tracemalloc.start()
+        snapshot = Snapshot().apply(categories=categories, rows=_synthetic_rows(n, categories))
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        self.stdout.write(
+            f"catalogue: {n} prompts retain {retained / 2**20:.1f} MiB "
+            f"({retained / n:.0f} B/prompt, prompt_text pool included)"
+        )
+
+        def catalogue_page(category, page):
+            return Paginator(snapshot.feed(category), page_size).page(page).object_list
+
+        self.stdout.write(
+            f"catalogue page (synthetic): all p1 {_timeit(lambda: catalogue_page('all', 1), runs):.3f} ms, "
+            f"all p{n // page_size // 2} {_timeit(lambda: catalogue_page('all', n // page_size // 2), runs):.3f} ms, "
+            f"cat-3 p1 {_timeit(lambda: catalogue_page('cat-3', 1), runs):.3f} ms"
+        )
+
+        # Same DB pe dono asli paths (build_feed_page, cache bypass)
+        with override_settings(CATALOGUE_ENABLED=False):
+            orm = _timeit(lambda: views.build_feed_page('all', '1'), runs)
+        with override_settings(CATALOGUE_ENABLED=True):
+            views.build_feed_page('all', '1')   # load
+            mem = _timeit(lambda: views.build_feed_page('all', '1'), runs)
+        self.stdout.write(
+            f"build_feed_page('all', 1) on {settings.DATABASES['default']['NAME']}: "
+            f"ORM+DRF {orm:.3f} ms, catalogue {mem:.3f} ms"
+        )
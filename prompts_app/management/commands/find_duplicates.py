@@ -0,0 +1,113 @@
+# prompts_app/management/commands/find_duplicates.py
+#
+# Poore catalogue mein near-duplicate clusters:
+#   1. jin prompts ka MinHash signature nahi hai (ya --rebuild pe sab) unke
+#      signatures batches mein multiprocessing Pool se banao + LSH buckets likho
+#   2. same (band, bucket) wale prompts candidate pairs; signature similarity
+#      >= --threshold wale union-find se clusters mein
+#
+#   python manage.py find_duplicates --workers 4 --batch-size 2000
+
+import json
+import time
+from collections import defaultdict
+from itertools import groupby
+from multiprocessing import Pool
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from prompts_app import dedup
+from prompts_app.models import Prompt, PromptLSHBucket, PromptSignature
+
+# Bahut bade bucket (jaise khaali/boilerplate text) mein har member ko sirf pehle itnon se milao
+MAX_PAIRWISE = 50
+
+
+class Command(BaseCommand):
+    help = "Backfill MinHash/LSH signatures and report near-duplicate prompt clusters"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Processes (default: CPU count)')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--threshold', type=float, default=None,
+                            help='Estimated Jaccard (default: DEDUP_THRESHOLD)')
+        parser.add_argument('--rebuild', action='store_true', help='Recompute every signature')
+        parser.add_argument('--json', action='store_true', help='Print clusters as JSON')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        indexed = self._backfill(options)
+        clusters = self._cluster(options['threshold'] or settings.DEDUP_THRESHOLD)
+
+        titles = dict(Prompt.objects.filter(
+            pk__in={pk for cluster in clusters for pk in cluster}
+        ).values_list('pk', 'title'))
+        if options['json']:
+            self.stdout.write(json.dumps([
+                [{'id': str(pk), 'title': titles.get(pk, '')} for pk in cluster]
+                for cluster in clusters
+            ], indent=2))
+            return
+
+        for cluster in clusters:
+            self.stdout.write(f"{len(cluster)} prompts:")
+            for pk in cluster:
+                self.stdout.write(f"    {pk}  {titles.get(pk, '')}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {indexed} prompts, {len(clusters)} duplicate clusters "
+            f"({sum(len(c) for c in clusters)} prompts) in {time.perf_counter() - start:.1f}s"
+        ))
+
+    def _backfill(self, options):
+        prompts = Prompt.objects.order_by('pk')
+        if not options['rebuild']:
+            prompts = prompts.filter(signature__isnull=True)
+        pks = list(prompts.values_list('pk', flat=True))
+        size = options['batch_size']
+
+        with Pool(options['workers']) as pool:
+            for i in range(0, len(pks), size):
+                batch = list(Prompt.objects.filter(pk__in=pks[i:i + size]).values_list('pk', 'prompt_text'))
+                signatures = pool.map(dedup.minhash, [text for _, text in batch], chunksize=64)
+                dedup.index_prompts((), {pk: sig for (pk, _), sig in zip(batch, signatures)})
+                self.stdout.write(f"  signatures: {min(i + size, len(pks))}/{len(pks)}")
+        return len(pks)
+
+    def _cluster(self, threshold):
+        signatures = {
+            pk: dedup._load(blob)
+            for pk, blob in PromptSignature.objects.values_list('prompt_id', 'minhash').iterator(chunk_size=5000)
+        }
+        parent = {}
+
+        def find(x):
+            while parent.get(x, x) != x:
+                parent[x] = parent.get(parent[x], parent[x])
+                x = parent[x]
+            return x
+
+        checked = set()
+        rows = (
+            PromptLSHBucket.objects.order_by('band', 'bucket')
+            .values_list('band', 'bucket', 'prompt_id').iterator(chunk_size=10000)
+        )
+        for _, group in groupby(rows, key=lambda row: row[:2]):
+            members = [pk for _, _, pk in group]
+            if len(members) < 2:
+                continue
+            for i, a in enumerate(members):
+                for b in members[:min(i, MAX_PAIRWISE)]:
+                    pair = (a, b) if a < b else (b, a)
+                    if pair in checked:
+                        continue
+                    checked.add(pair)
+                    if dedup.similarity(signatures[a], signatures[b]) >= threshold:
+                        parent.setdefault(a, a)
+                        parent.setdefault(b, b)
+                        parent[find(a)] = find(b)
+
+        clusters = defaultdict(list)
+        for pk in parent:
+            clusters[find(pk)].append(pk)
+        return sorted((sorted(c) for c in clusters.values() if len(c) > 1), key=len, reverse=True)
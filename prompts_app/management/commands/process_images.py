@@ -0,0 +1,116 @@
+# prompts_app/management/commands/process_images.py
+#
+# Local directory ki images se prompts ke thumbnails + metadata:
+#   - file match: stem == prompt id, ya stem == prompt.image_url ke basename ka stem
+#   - incremental: jis prompt ki PromptImage.source_hash file ke hash jaisi hai woh skip
+#   - dedup: same hash pehle process ho chuka ho (kisi bhi prompt pe) to reuse;
+#     sirf naye hashes multiprocessing Pool mein render hote hain
+#
+#   python manage.py process_images prompts/ --workers 4
+
+import os
+import time
+from multiprocessing import Pool
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from prompts_app import images
+from prompts_app.models import Prompt, PromptImage
+from prompts_app.views import invalidate_feed_caches
+
+EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp'}
+
+
+def _safe_render(path):
+    # Ek kharab file (ya decompression bomb) poora pool na gira de — error message string wapas
+    try:
+        with open(path, 'rb') as f:
+            return images.render(f.read())
+    except (OSError, ValueError, *images.INVALID_IMAGE_ERRORS) as exc:
+        return str(exc) or type(exc).__name__
+
+
+class Command(BaseCommand):
+    help = "Generate WebP thumbnails, size and blur placeholder for prompt images in a local directory"
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Processes (default: THUMBNAIL_WORKERS, 0 = CPU count)')
+        parser.add_argument('--force', action='store_true', help='Re-render even if already processed')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        directory = options['directory']
+        if not os.path.isdir(directory):
+            raise CommandError(f'{directory} is not a directory')
+
+        files = {}
+        for name in sorted(os.listdir(directory)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() in EXTENSIONS:
+                files.setdefault(stem.lower(), os.path.join(directory, name))
+
+        # prompt → file
+        matched = {}
+        for pk, image_url, slug in Prompt.objects.values_list('pk', 'image_url', 'category__slug'):
+            stem = str(pk)
+            if stem not in files and image_url:
+                stem = os.path.splitext(os.path.basename(urlparse(image_url).path))[0].lower()
+            if stem in files:
+                matched[pk] = (files[stem], slug)
+        if not matched:
+            self.stdout.write('No images matched any prompt.')
+            return
+
+        # Hash main process mein (sasta) — kya render karna hai wahi tay karta hai
+        hashes = {}
+        for path, _ in matched.values():
+            if path not in hashes:
+                with open(path, 'rb') as f:
+                    hashes[path] = images.content_hash(f.read())
+        current = dict(PromptImage.objects.filter(prompt_id__in=matched).values_list('prompt_id', 'source_hash'))
+        todo = {
+            pk: hashes[path] for pk, (path, _) in matched.items()
+            if options['force'] or current.get(pk) != hashes[path]
+        }
+
+        metadata = {}
+        if not options['force']:
+            for digest in set(todo.values()):
+                known = images.existing_metadata(digest)
+                if known:
+                    metadata[digest] = known
+        paths = {}
+        for pk, digest in todo.items():
+            if digest not in metadata:
+                paths.setdefault(digest, matched[pk][0])
+
+        workers = options['workers'] if options['workers'] is not None else settings.THUMBNAIL_WORKERS
+        failed = 0
+        if paths:
+            if workers == 1 or len(paths) == 1:
+                results = list(map(_safe_render, paths.values()))
+            else:
+                with Pool(workers or None) as pool:
+                    results = pool.map(_safe_render, paths.values(), chunksize=4)
+            for digest, result in zip(paths, results):
+                if isinstance(result, str):
+                    self.stderr.write(f'{paths[digest]}: {result}')
+                    failed += 1
+                else:
+                    metadata[digest] = result
+
+        attached = {pk: metadata[digest] for pk, digest in todo.items() if digest in metadata}
+        if attached:
+            images.attach(attached)
+            invalidate_feed_caches({matched[pk][1] for pk in attached}, attached)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(matched)} prompts matched, {len(matched) - len(todo)} up to date, '
+            f'{len(paths) - failed} images rendered, {len(attached)} prompts updated, '
+            f'{failed} failed in {elapsed:.2f}s'
+        ))
@@ -0,0 +1,75 @@
+# prompts_app/management/commands/response_format_benchmark.py
+#
+# Feed page ke response formats (prompts_app/renderers.py) ka muqabla:
+# JSON (aaj ka output) vs columnar JSON vs MessagePack vs columnar MessagePack.
+#   - bytes (raw aur gzip — proxy/CDN compress kare tab)
+#   - server pe encode time (renderer.render) aur client jaisa decode time
+# Page asli PromptList view se (?page_size=N → PromptPagination ka envelope,
+# personalize_page ke links) — wahi data jo renderer ko milta hai.
+#
+#   python manage.py response_format_benchmark --page-size 50 --runs 200
+
+import gzip
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory
+
+from prompts_app import renderers
+from prompts_app.views import PromptList, PromptPagination
+
+
+def _timeit(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+class Command(BaseCommand):
+    help = "Compare size and encode/decode time of JSON, MessagePack and columnar feed pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=PromptPagination.max_page_size)
+        parser.add_argument('--runs', type=int, default=200)
+
+    def handle(self, *args, **options):
+        page_size, runs = options['page_size'], options['runs']
+        request = APIRequestFactory().get('/api/prompts/', {'page_size': page_size})
+        response = PromptList.as_view()(request)
+        if response.status_code != 200:
+            raise CommandError(f'PromptList returned {response.status_code}')
+        page = response.data
+        results = page['results']
+        if not results:
+            raise CommandError('No prompts in the database')
+
+        formats = [
+            ('json', renderers.CompactJSONRenderer(), 'application/json', json.loads),
+            ('json columnar', renderers.CompactJSONRenderer(), 'application/json; layout=columnar', json.loads),
+        ]
+        if renderers.msgpack is None:
+            self.stderr.write('msgpack not installed — JSON formats only')
+        else:
+            unpack = renderers.msgpack.unpackb
+            formats += [
+                ('msgpack', renderers.MessagePackRenderer(), 'application/msgpack', unpack),
+                ('msgpack columnar', renderers.MessagePackRenderer(), 'application/msgpack; layout=columnar', unpack),
+            ]
+
+        self.stdout.write(f"{len(results)} prompts/page, median of {runs} runs")
+        self.stdout.write(f"{'format':<18}{'bytes':>9}{'gzip':>9}{'encode us':>12}{'decode us':>12}")
+        baseline = None
+        for label, renderer, media_type, decode in formats:
+            content = renderer.render(page, media_type, {})
+            encode_us = _timeit(lambda: renderer.render(page, media_type, {}), runs)
+            decode_us = _timeit(lambda: decode(content), runs)
+            baseline = baseline or len(content)
+            self.stdout.write(
+                f"{label:<18}{len(content):>9}{len(gzip.compress(content)):>9}"
+                f"{encode_us:>12.0f}{decode_us:>12.0f}   {len(content) / baseline:5.0%} of json"
+            )
@@ -0,0 +1,29 @@
+# prompts_app/management/commands/rollup_analytics.py
+#
+# Cache event stream ke pending segments daily rollup tables mein (cron ke liye;
+# workers bhi ANALYTICS_ROLLUP_INTERVAL pe khud karte hain). Dobara chalana safe hai.
+#
+#   python manage.py rollup_analytics
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from prompts_app import analytics
+
+
+class Command(BaseCommand):
+    help = "Roll up buffered view/like events into daily per-prompt and per-category stats"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-chunks', type=int, default=None,
+                            help='Stop after this many chunks (default: catch up fully)')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        analytics.flush()   # is process ka apna buffer bhi
+        segments, lost = analytics.rollup(max_chunks=options['max_chunks'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{segments} segments rolled up ({lost} expired) in {elapsed:.2f}s'
+        ))
@@ -0,0 +1,104 @@
+# prompts_app/management/commands/startup_benchmark.py
+#
+# Worker boot ka cost naapta hai — har run ek fresh interpreter mein:
+#   - import time per top-level package (`python -X importtime`)
+#   - django.setup() + WSGI app + pehli request (/health/) tak ka time
+#   - process ka peak RSS
+#
+#   python manage.py startup_benchmark --runs 5
+#   python manage.py startup_benchmark --compare      # full vs API_ONLY=True
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Child process mein chalta hai
+PROBE = r"""
+import json, os, resource, sys, time
+t0 = time.perf_counter()
+import django
+django.setup()
+t1 = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+application = get_wsgi_application()
+t2 = time.perf_counter()
+response = Client().get('/health/', HTTP_HOST='localhost')
+t3 = time.perf_counter()
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    'setup_ms': (t1 - t0) * 1000,
+    'wsgi_ms': (t2 - t1) * 1000,
+    'first_request_ms': (t3 - t2) * 1000,
+    'total_ms': (t3 - t0) * 1000,
+    'rss_mb': rss_kb / 1024,
+    'status': response.status_code,
+    'apps': len(__import__('django.conf').conf.settings.INSTALLED_APPS),
+}))
+"""
+
+
+def _run_probe(env):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=str(settings.BASE_DIR), env=env, capture_output=True, text=True, check=True,
+    )
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+
+    # importtime stderr: "import time: self [us] | cumulative | imported package"
+    per_package = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, _cumulative, name = line[len('import time:'):].split('|')
+        per_package[name.strip().split('.')[0]] += int(self_us)
+    return stats, per_package
+
+
+class Command(BaseCommand):
+    help = "Measure worker startup: import time per package, time to first request, peak RSS"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3)
+        parser.add_argument('--top', type=int, default=15, help='Slowest packages to list')
+        parser.add_argument('--compare', action='store_true',
+                            help='Run both the full and the API_ONLY=True profile')
+
+    def handle(self, *args, **options):
+        profiles = {'current': {}}
+        if options['compare']:
+            profiles = {'full': {'API_ONLY': 'False'}, 'api-only': {'API_ONLY': 'True'}}
+
+        for label, overrides in profiles.items():
+            env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get(
+                'DJANGO_SETTINGS_MODULE', 'ai_prompt_hub.settings'), **overrides}
+            runs, packages = [], defaultdict(list)
+            for _ in range(options['runs']):
+                stats, per_package = _run_probe(env)
+                runs.append(stats)
+                for name, us in per_package.items():
+                    packages[name].append(us)
+
+            def median(field):
+                return statistics.median(run[field] for run in runs)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"[{label}] {options['runs']} runs, {runs[0]['apps']} apps, /health/ -> {runs[0]['status']}"
+            ))
+            self.stdout.write(
+                f"  django.setup()   {median('setup_ms'):8.1f} ms\n"
+                f"  WSGI app         {median('wsgi_ms'):8.1f} ms\n"
+                f"  first request    {median('first_request_ms'):8.1f} ms\n"
+                f"  total            {median('total_ms'):8.1f} ms\n"
+                f"  peak RSS         {median('rss_mb'):8.1f} MB"
+            )
+            slowest = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))
+            self.stdout.write("  import time (self, median):")
+            for name, samples in slowest[:options['top']]:
+                self.stdout.write(f"    {statistics.median(samples) / 1000:8.1f} ms  {name}")
@@ -0,0 +1,86 @@
+# prompts_app/management/commands/throttle_benchmark.py
+#
+# Token-bucket throttle ka kharcha:
+#   - allow_request() akela (local buckets, file cache / Redis L2 ho to woh bhi)
+#   - poora LikeToggle-jaisa public view (favourites list) throttle on/off,
+#     har request naya device + IP (kabhi limit nahi hota)
+#   - limit ke baad 429 — time aur DB queries per request
+#
+#   python manage.py throttle_benchmark --requests 1000
+
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from prompts_app import throttling
+from prompts_app.views import FavouriteListCreate
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-request overhead of the token-bucket throttles"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        n = options['requests']
+        factory = APIRequestFactory()
+        view = FavouriteListCreate()
+        requests = [
+            Request(factory.get('/api/favourites/', {'device_id': uuid.uuid4().hex}, REMOTE_ADDR=f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}'))
+            for i in range(n)
+        ]
+        for request in requests:
+            request.query_params   # view waise bhi parse karta hai — sirf throttle ka kharcha naapo
+
+        backends = [('local', throttling.LocalBuckets())]
+        files = throttling._file_cache()
+        if files is not None:
+            backends.append(('file', throttling.FileBuckets(files)))
+        redis = throttling._redis_cache()
+        if redis is not None:
+            backends.append(('redis', throttling.RedisBuckets(redis)))
+        throttle = throttling.TokenBucketThrottle()
+        for label, backend in backends:
+            throttling._backend = backend
+            start = time.perf_counter()
+            for request in requests:
+                throttle.allow_request(request, view)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"allow_request ({label:<5})        {elapsed / n * 1e6:8.1f} us/request")
+        throttling._backend = None
+
+        client = Client()
+        for i in range(20):   # warm-up (URL resolver, serializers)
+            client.get('/api/favourites/', {'device_id': f'bench-warm-{i}'})
+        for label, enabled in (('off', False), ('on', True)):
+            with override_settings(THROTTLE_ENABLED=enabled):
+                start = time.perf_counter()
+                for i in range(n):
+                    client.get('/api/favourites/', {'device_id': f'bench-{label}-{i}'},
+                               REMOTE_ADDR=f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}')
+                elapsed = time.perf_counter() - start
+            self.stdout.write(f"GET /api/favourites/ throttle {label:<3} {elapsed / n * 1e6:8.1f} us/request")
+
+        # Ek device ki bucket khaali karo, phir 429 ka kharcha
+        statuses = set()
+        for _ in range(10000):
+            response = client.get('/api/favourites/', {'device_id': 'bench-limited'}, REMOTE_ADDR='10.255.255.255')
+            if response.status_code == 429:
+                break
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(n):
+                statuses.add(client.get('/api/favourites/', {'device_id': 'bench-limited'},
+                                        REMOTE_ADDR='10.255.255.255').status_code)
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"rejected (status {sorted(statuses)})       {elapsed / n * 1e6:8.1f} us/request  "
+            f"{len(queries) / n:.2f} queries/request"
+        )
@@ -0,0 +1,28 @@
+# prompts_app/management/commands/warm_cache.py
+
+from django.core.management.base import BaseCommand
+
+from prompts_app.warmup import warm_cache
+
+
+class Command(BaseCommand):
+    help = "Pre-populate the cache with category_list, ads/AdMob config and the first K feed pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=None,
+                            help='Feed pages per category (default: CACHE_WARM_PAGES)')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Render threads (default: CACHE_WARM_WORKERS)')
+        parser.add_argument('--force', action='store_true',
+                            help='Rebuild even if the key is already cached')
+
+    def handle(self, *args, **options):
+        stats = warm_cache(
+            pages=options['pages'], workers=options['workers'], force=options['force'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {stats['keys']} keys, {stats['bytes'] / 1024:.1f} KiB "
+            f"in {stats['seconds']:.2f}s"
+        ))
+        for key in stats['failed']:
+            self.stderr.write(f"  failed: {key}")
@@ -0,0 +1,87 @@
+# prompts_app/management/commands/write_benchmark.py
+#
+# Chalte hue server (jaise `gunicorn -w 4 ai_prompt_hub.wsgi`) pe concurrent
+# writes ka load: LikeToggle POSTs aur PromptDetail GETs (usage increment).
+# Sustained throughput, latency aur errors (jaise `database is locked` wale 500s) report karta hai.
+#
+#   python manage.py write_benchmark --url http://127.0.0.1:8000 --concurrency 32 --seconds 10
+
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from prompts_app.models import Prompt
+
+
+class Command(BaseCommand):
+    help = "Concurrent like/usage write load against a running server"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--devices', type=int, default=200, help='Distinct device ids')
+
+    def handle(self, *args, **options):
+        prompt_ids = [str(pk) for pk in Prompt.objects.values_list('pk', flat=True)[:50]]
+        if not prompt_ids:
+            raise CommandError('No prompts in the database')
+
+        base = options['url'].rstrip('/')
+        devices = [f'bench-{uuid.uuid4().hex[:12]}' for _ in range(options['devices'])]
+        deadline = time.monotonic() + options['seconds']
+        latencies, statuses = [], Counter()
+        lock = threading.Lock()
+
+        def request(i):
+            prompt = prompt_ids[i % len(prompt_ids)]
+            if i % 2:
+                body = json.dumps({'device_id': devices[i % len(devices)]}).encode()
+                req = urllib.request.Request(
+                    f'{base}/api/like/{prompt}/', data=body,
+                    headers={'Content-Type': 'application/json'}, method='POST',
+                )
+            else:
+                req = urllib.request.Request(f'{base}/api/prompts/{prompt}/')
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(req, timeout=60) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as exc:
+                status = exc.code
+            except OSError:
+                status = 'conn-error'
+            return status, time.perf_counter() - start
+
+        def worker(offset):
+            i = offset
+            while time.monotonic() < deadline:
+                status, elapsed = request(i)
+                with lock:
+                    statuses[status] += 1
+                    latencies.append(elapsed)
+                i += options['concurrency']
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(worker, range(options['concurrency'])))
+        elapsed = time.perf_counter() - start
+
+        total = sum(statuses.values())
+        latencies.sort()
+        self.stdout.write(
+            f"{total} requests in {elapsed:.1f}s = {total / elapsed:.0f} req/s "
+            f"(concurrency {options['concurrency']})\n"
+            f"latency p50 {statistics.median(latencies) * 1000:.1f} ms, "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms\n"
+            f"statuses: {dict(statuses)}"
+        )
@@ -0,0 +1,320 @@
+# prompts_app/metrics.py - Prometheus-style instrumentation
+#
+# Har gunicorn worker apne counters/histograms memory mein rakhta hai aur
+# unhe METRICS_DIR/metrics-<pid>-<start ms>.json mein periodically flush karta
+# hai (start time: recycled pid purane worker ki file overwrite na kare).
+# /metrics/ endpoint saari worker files merge karke Prometheus text format
+# mein expose karta hai — isliye koi shared server (pushgateway etc.) nahi chahiye.
+#
+# Worker marne pe gunicorn master (child_exit, gunicorn.conf.py) uski file
+# metrics-archive.json mein jod ke hata deta hai — counters peeche nahi jaate
+# aur dead workers ki files jama nahi hoti.
+
+import hmac
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.renderers import BaseRenderer
+
+
+ARCHIVE_FILE = 'metrics-archive.json'
+# Archive mein itne aakhri merged file names (collect() unhe double count na kare)
+ARCHIVE_KEEP_NAMES = 1000
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    'http_requests_total': (
+        'counter', 'Total HTTP requests by view, method and status.'),
+    'http_request_duration_seconds': (
+        'histogram', 'Request latency in seconds by view and method.'),
+    'db_queries_total': (
+        'counter', 'Database queries executed, by view.'),
+    'db_query_duration_seconds_total': (
+        'counter', 'Total time spent in database queries, by view.'),
+    'cache_requests_total': (
+        'counter', 'Cache lookups by key family and result (hit/miss/stale).'),
+    'cache_invalidations_total': (
+        'counter', 'Cache keys deleted on writes, by key family.'),
+    'prompt_likes_total': (
+        'counter', 'Like toggles by action (like/unlike).'),
+}
+
+
+# ===================== REGISTRY =====================
+
+class Registry:
+    def __init__(self, directory, flush_interval=1.0):
+        self.directory = str(directory)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._last_flush = 0.0
+        self._dirty = False
+        self._pid = None
+        self._started = None
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._dirty = True
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                # [bucket counts..., sum, count]
+                hist = self._histograms[key] = [0] * len(LATENCY_BUCKETS) + [0.0, 0]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    hist[i] += 1
+            hist[-2] += value
+            hist[-1] += 1
+            self._dirty = True
+
+    # ── per-worker file store ────────────────────────────────────────────
+
+    def _path(self):
+        if self._pid != os.getpid():   # fork ke baad naya worker
+            self._pid, self._started = os.getpid(), int(time.time() * 1000)
+        return os.path.join(self.directory, f'metrics-{self._pid}-{self._started}.json')
+
+    def maybe_flush(self):
+        if self._dirty and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            snapshot = {
+                'counters': [[n, list(l), v] for (n, l), v in self._counters.items()],
+                'histograms': [[n, list(l), h] for (n, l), h in self._histograms.items()],
+            }
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+        os.makedirs(self.directory, exist_ok=True)
+        _write(self._path(), snapshot)
+
+    def _worker_files(self):
+        return [
+            name for name in os.listdir(self.directory)
+            if name.startswith('metrics-') and name.endswith('.json') and name != ARCHIVE_FILE
+        ]
+
+    def collect(self):
+        """Merge every worker's file (and the dead workers' archive) into one view."""
+        self.flush()
+        files = {name: _read(os.path.join(self.directory, name)) for name in self._worker_files()}
+        # Archive files ke BAAD padho: beech mein archive hui file yahan listed milegi
+        archive = _read(os.path.join(self.directory, ARCHIVE_FILE)) or {}
+        archived = set(archive.get('files', []))
+        counters, histograms = {}, {}
+        for name, data in files.items():
+            if data and name not in archived:
+                _merge(counters, histograms, data)
+        _merge(counters, histograms, archive)
+        return counters, histograms
+
+    def archive(self, pid):
+        """Fold a dead worker's files into the archive and delete them (gunicorn master)."""
+        names = [
+            name for name in self._worker_files()
+            if name == f'metrics-{pid}.json' or name.startswith(f'metrics-{pid}-')
+        ]
+        if not names:
+            return
+        path = os.path.join(self.directory, ARCHIVE_FILE)
+        counters, histograms = {}, {}
+        archive = _read(path) or {}
+        _merge(counters, histograms, archive)
+        for name in names:
+            _merge(counters, histograms, _read(os.path.join(self.directory, name)) or {})
+        _write(path, {
+            'counters': [[n, list(l), v] for (n, l), v in counters.items()],
+            'histograms': [[n, list(l), h] for (n, l), h in histograms.items()],
+            'files': (archive.get('files', []) + names)[-ARCHIVE_KEEP_NAMES:],
+        })
+        for name in names:   # archive likhne ke baad hi — collect() beech mein double/under count na kare
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+def _read(path):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump(data, fh)
+    os.replace(tmp, path)  # atomic — reader ko kabhi aadhi file nahi milegi
+
+
+def _merge(counters, histograms, data):
+    for name, labels, value in data.get('counters', []):
+        key = (name, tuple(tuple(l) for l in labels))
+        counters[key] = counters.get(key, 0) + value
+    for name, labels, hist in data.get('histograms', []):
+        key = (name, tuple(tuple(l) for l in labels))
+        merged = histograms.get(key)
+        if merged is None:
+            histograms[key] = list(hist)
+        else:
+            for i, v in enumerate(hist):
+                merged[i] += v
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def render_prometheus(counters, histograms):
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'counter':
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append(f'{name}{_labels(labels)} {value}')
+        else:
+            for (n, labels), hist in sorted(histograms.items()):
+                if n != name:
+                    continue
+                for bound, count in zip(LATENCY_BUCKETS, hist):
+                    lines.append(f'{name}_bucket{_labels(labels + (("le", bound),))} {count}')
+                lines.append(f'{name}_bucket{_labels(labels + (("le", "+Inf"),))} {hist[-1]}')
+                lines.append(f'{name}_sum{_labels(labels)} {hist[-2]}')
+                lines.append(f'{name}_count{_labels(labels)} {hist[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = Registry(
+    getattr(settings, 'METRICS_DIR', '/tmp/ai_prompt_hub_metrics'),
+    getattr(settings, 'METRICS_FLUSH_INTERVAL', 1.0),
+)
+
+
+# ===================== HOOKS (views.py se call hote hain) =====================
+
+def record_cache(family, hit):
+    # hit: True / False, ya seedha result label (e.g. 'stale')
+    result = hit if isinstance(hit, str) else ('hit' if hit else 'miss')
+    registry.inc('cache_requests_total', family=family, result=result)
+
+
+def record_invalidation(family, count=1):
+    registry.inc('cache_invalidations_total', count, family=family)
+
+
+def record_like(liked):
+    registry.inc('prompt_likes_total', action='like' if liked else 'unlike')
+
+
+# ===================== MIDDLEWARE =====================
+
+class _QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def view_name(view_func):
+    view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+    if view_class is not None:
+        return view_class.__name__
+    return getattr(view_func, '__name__', 'unknown')
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = _QueryTimer()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(timer))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        view = getattr(request, '_metrics_view', 'unresolved')
+        registry.inc('http_requests_total', view=view, method=request.method,
+                     status=response.status_code)
+        registry.observe('http_request_duration_seconds', elapsed, view=view,
+                         method=request.method)
+        if timer.count:
+            registry.inc('db_queries_total', timer.count, view=view)
+            registry.inc('db_query_duration_seconds_total', timer.duration, view=view)
+        registry.maybe_flush()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = view_name(view_func)
+
+
+# ===================== /metrics/ ENDPOINT =====================
+
+class HasMetricsToken(BasePermission):
+    """Prometheus scraper ke liye: `Authorization: Token <METRICS_TOKEN>`.
+
+    `Bearer` prefix JWTAuthentication ka hai, isliye scraper `Token` bhejta hai.
+    """
+
+    def has_permission(self, request, view):
+        token = getattr(settings, 'METRICS_TOKEN', None)
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        # Constant-time compare (timing se token ka andaaza na lage)
+        return bool(token) and hmac.compare_digest(header.encode(), f'Token {token}'.encode())
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data if isinstance(data, str) else json.dumps(data)
+
+
+@api_view(['GET'])
+@permission_classes([HasMetricsToken | IsAuthenticated])
+@renderer_classes([PrometheusRenderer])
+def metrics_view(request):
+    counters, histograms = registry.collect()
+    return HttpResponse(
+        render_prometheus(counters, histograms),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:44
+
+from django.db import migrations, models
+
+
+# AdmobConfig ka CreateModel yahan se 0016_admobconfig mein gaya (conditional create).
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompts_app', '0006_ad'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionLog',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('prompt', 'Prompt'), ('category', 'Category')], max_length=10)),
+                ('object_id', models.UUIDField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='ad',
+            name='duration_days',
+            field=models.PositiveIntegerField(default=7),
+        ),
+        migrations.AlterField(
+            model_name='ad',
+            name='show_after_seconds',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='prompt',
+            index=models.Index(fields=['updated_at', 'id'], name='prompt_sync_idx'),
+        ),
+    ]
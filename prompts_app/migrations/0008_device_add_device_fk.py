@@ -0,0 +1,62 @@
+# Device registry, step 1/3: Device table + nullable `device` FK.
+# Purana string column `legacy_device_id` ban jata hai (0009 usse copy karta hai,
+# 0010 use hata deta hai). Steps alag migrations mein hain taaki Postgres pe
+# data UPDATE aur ALTER TABLE ek hi transaction mein na ho.
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompts_app', '0007_deletionlog_prompt_sync_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Device',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('device_id', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='favourite',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='promptlike',
+            unique_together=set(),
+        ),
+        migrations.RenameField(
+            model_name='favourite',
+            old_name='device_id',
+            new_name='legacy_device_id',
+        ),
+        migrations.RenameField(
+            model_name='promptlike',
+            old_name='device_id',
+            new_name='legacy_device_id',
+        ),
+        migrations.AlterField(
+            model_name='favourite',
+            name='legacy_device_id',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='promptlike',
+            name='legacy_device_id',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='favourite',
+            name='device',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='favourites', to='prompts_app.device'),
+        ),
+        migrations.AddField(
+            model_name='promptlike',
+            name='device',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='prompts_app.device'),
+        ),
+    ]
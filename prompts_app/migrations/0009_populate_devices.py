@@ -0,0 +1,72 @@
+# Device registry, step 2/3: batched copy legacy_device_id → Device + device FK.
+#
+# Har batch: naye device strings bulk_create (ignore_conflicts), phir rows ka
+# `device` ek set-based UPDATE (correlated subquery) se bharte hain — row-by-row nahi.
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def populate_devices(apps, schema_editor):
+    Device = apps.get_model('prompts_app', 'Device')
+    db = schema_editor.connection.alias
+
+    for model_name in ('Favourite', 'PromptLike'):
+        Model = apps.get_model('prompts_app', model_name)
+        rows = Model.objects.using(db)
+
+        strings = (
+            rows.exclude(legacy_device_id=None)
+            .order_by('legacy_device_id')
+            .values_list('legacy_device_id', flat=True)
+            .distinct()
+            .iterator(chunk_size=BATCH_SIZE)
+        )
+        batch = []
+        for value in strings:
+            batch.append(Device(device_id=value))
+            if len(batch) >= BATCH_SIZE:
+                Device.objects.using(db).bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        if batch:
+            Device.objects.using(db).bulk_create(batch, ignore_conflicts=True)
+
+        device_pk = Subquery(
+            Device.objects.using(db)
+            .filter(device_id=OuterRef('legacy_device_id'))
+            .values('pk')[:1]
+        )
+        last_pk = 0
+        while True:
+            ids = list(
+                rows.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', flat=True)[:BATCH_SIZE]
+            )
+            if not ids:
+                break
+            rows.filter(pk__gte=ids[0], pk__lte=ids[-1]).update(device=device_pk)
+            last_pk = ids[-1]
+
+
+def restore_legacy_ids(apps, schema_editor):
+    db = schema_editor.connection.alias
+    Device = apps.get_model('prompts_app', 'Device')
+    device_string = Subquery(
+        Device.objects.using(db).filter(pk=OuterRef('device_id')).values('device_id')[:1]
+    )
+    for model_name in ('Favourite', 'PromptLike'):
+        Model = apps.get_model('prompts_app', model_name)
+        Model.objects.using(db).update(legacy_device_id=device_string)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompts_app', '0008_device_add_device_fk'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_devices, restore_legacy_ids),
+    ]
@@ -0,0 +1,40 @@
+# Device registry, step 3/3: device NOT NULL, string column drop, (device, prompt) unique.
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompts_app', '0009_populate_devices'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='favourite',
+            name='device',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='favourites', to='prompts_app.device'),
+        ),
+        migrations.AlterField(
+            model_name='promptlike',
+            name='device',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='prompts_app.device'),
+        ),
+        migrations.RemoveField(
+            model_name='favourite',
+            name='legacy_device_id',
+        ),
+        migrations.RemoveField(
+            model_name='promptlike',
+            name='legacy_device_id',
+        ),
+        migrations.AlterUniqueTogether(
+            name='favourite',
+            unique_together={('device', 'prompt')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='promptlike',
+            unique_together={('device', 'prompt')},
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Admin search (PromptAdmin.get_search_results) ke liye Postgres GIN full-text
+# index. Expression wahi hai jo admin query mein hai, warna planner index use
+# nahi karega. SQLite pe kuch nahi hota.
+
+from django.db import migrations
+
+INDEX_NAME = 'prompt_fts_idx'
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON prompts_app_prompt "
+        "USING GIN (to_tsvector('simple', title || ' ' || prompt_text))"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompts_app', '0010_device_finalize'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
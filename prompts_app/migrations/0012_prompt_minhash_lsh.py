@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompts_app', '0011_prompt_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PromptSignature',
+            fields=[
+                ('prompt', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='prompts_app.prompt')),
+                ('minhash', models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PromptLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('band', models.SmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('prompt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='prompts_app.prompt')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='prompt_lsh_bucket_idx')],
+            },
+        ),
+    ]
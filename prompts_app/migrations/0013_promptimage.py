@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompts_app', '0012_prompt_minhash_lsh'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PromptImage',
+            fields=[
+                ('prompt', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='image', serialize=False, to='prompts_app.prompt')),
+                ('source_hash', models.CharField(db_index=True, max_length=64)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('placeholder', models.TextField(blank=True)),
+                ('thumbnails', models.JSONField(default=dict)),
+                ('processed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompts_app', '0014_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdDailyStats',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('impressions', models.PositiveIntegerField(default=0)),
+                ('clicks', models.PositiveIntegerField(default=0)),
+                ('ad', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='prompts_app.ad')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('date', 'ad'), name='ad_daily_stats_uniq')],
+            },
+        ),
+    ]
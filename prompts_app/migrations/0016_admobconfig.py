@@ -0,0 +1,58 @@
+# AdmobConfig table — pehle 0007_deletionlog_prompt_sync_idx mein purane model
+# change ka drift bana pada tha. Kai production DBs mein yeh table pehle se hai
+# (server ka /run-migrations/ makemigrations chala chuka), wahan CREATE TABLE
+# "already exists" se migrate tod deta. Isliye state mein model, aur table
+# sirf tab banti hai jab maujood na ho. --fake ki zaroorat nahi.
+
+import uuid
+
+from django.db import migrations, models
+
+
+def create_if_missing(apps, schema_editor):
+    AdmobConfig = apps.get_model('prompts_app', 'AdmobConfig')
+    if AdmobConfig._meta.db_table not in schema_editor.connection.introspection.table_names():
+        schema_editor.create_model(AdmobConfig)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompts_app', '0015_ad_daily_stats'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='AdmobConfig',
+                    fields=[
+                        ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                        ('is_active', models.BooleanField(default=True)),
+                        ('app_id_android', models.CharField(blank=True, default='ca-app-pub-xxxxxxxxxxxxxxxx~yyyyyyyyyy', max_length=100)),
+                        ('app_id_ios', models.CharField(blank=True, default='ca-app-pub-xxxxxxxxxxxxxxxx~yyyyyyyyyy', max_length=100)),
+                        ('banner_android', models.CharField(blank=True, max_length=100)),
+                        ('banner_ios', models.CharField(blank=True, max_length=100)),
+                        ('interstitial_android', models.CharField(blank=True, max_length=100)),
+                        ('interstitial_ios', models.CharField(blank=True, max_length=100)),
+                        ('rewarded_android', models.CharField(blank=True, max_length=100)),
+                        ('rewarded_ios', models.CharField(blank=True, max_length=100)),
+                        ('rewarded_interstitial_android', models.CharField(blank=True, max_length=100)),
+                        ('rewarded_interstitial_ios', models.CharField(blank=True, max_length=100)),
+                        ('app_open_android', models.CharField(blank=True, max_length=100)),
+                        ('app_open_ios', models.CharField(blank=True, max_length=100)),
+                        ('native_android', models.CharField(blank=True, max_length=100)),
+                        ('native_ios', models.CharField(blank=True, max_length=100)),
+                        ('updated_at', models.DateTimeField(auto_now=True)),
+                        ('notes', models.TextField(blank=True, help_text='Kis date ko kisne change kiya tha')),
+                    ],
+                    options={
+                        'verbose_name': 'AdMob Configuration',
+                        'verbose_name_plural': 'AdMob Configuration',
+                    },
+                ),
+            ],
+        ),
+        # Reverse no-op: table purane DBs mein is migration se pehle ki ho sakti hai
+        migrations.RunPython(create_if_missing, migrations.RunPython.noop),
+    ]
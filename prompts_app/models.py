@@ -34,26 +34,140 @@ class Prompt(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # /prompts/changes/ keyset pagination
+            models.Index(fields=['updated_at', 'id'], name='prompt_sync_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class DeletionLog(models.Model):
+    """Tombstones for /prompts/changes/ — deleted prompt/category ids."""
+    KIND_CHOICES = [
+        ('prompt', 'Prompt'),
+        ('category', 'Category'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)   # monotonic sync cursor
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted"
+
+
+class Device(models.Model):
+    """App ka device string ek baar yahan; likes/favourites sirf integer pk rakhte hain."""
+    id = models.BigAutoField(primary_key=True)
+    device_id = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.device_id
+
+
 class Favourite(models.Model):
-    device_id = models.CharField(max_length=255)
+    # (device, prompt) unique index device lookups bhi cover karta hai — alag index nahi
+    device = models.ForeignKey(Device, on_delete=models.CASCADE, related_name='favourites', db_index=False)
     prompt = models.ForeignKey(Prompt, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ('device_id', 'prompt')
+        unique_together = ('device', 'prompt')
 
 
 class PromptLike(models.Model):
-    device_id = models.CharField(max_length=255)
+    device = models.ForeignKey(Device, on_delete=models.CASCADE, related_name='likes', db_index=False)
     prompt = models.ForeignKey(Prompt, on_delete=models.CASCADE, related_name='likes')
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ('device_id', 'prompt')
+        unique_together = ('device', 'prompt')
+
+
+class PromptImage(models.Model):
+    """Processed image metadata + WebP thumbnails (prompts_app/images.py)."""
+    prompt = models.OneToOneField(Prompt, on_delete=models.CASCADE, primary_key=True, related_name='image')
+    source_hash = models.CharField(max_length=64, db_index=True)   # sha256 of the original file
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    placeholder = models.TextField(blank=True)                      # tiny blurred WebP data URI
+    thumbnails = models.JSONField(default=dict)                     # {"<width>": "<url>"}
+    processed_at = models.DateTimeField(auto_now=True)
+
+
+class PromptDailyStats(models.Model):
+    """Daily per-prompt rollup of the analytics event stream (prompts_app/analytics.py)."""
+    id = models.BigAutoField(primary_key=True)
+    date = models.DateField()
+    prompt = models.ForeignKey(Prompt, on_delete=models.CASCADE, related_name='daily_stats')
+    views = models.PositiveIntegerField(default=0)
+    likes = models.PositiveIntegerField(default=0)
+    unlikes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Rollup upsert ka conflict target; date-range filters bhi isi se
+            models.UniqueConstraint(fields=['date', 'prompt'], name='prompt_daily_stats_uniq'),
+        ]
+
+
+class CategoryDailyStats(models.Model):
+    """Daily per-category rollup — /api/admin/stats/ totals isi chhoti table se."""
+    id = models.BigAutoField(primary_key=True)
+    date = models.DateField()
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='daily_stats')
+    views = models.PositiveIntegerField(default=0)
+    likes = models.PositiveIntegerField(default=0)
+    unlikes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'category'], name='category_daily_stats_uniq'),
+        ]
+
+
+class AdDailyStats(models.Model):
+    """Daily per-ad impressions/clicks, rolled up from the `ads` event stream."""
+    id = models.BigAutoField(primary_key=True)
+    date = models.DateField()
+    ad = models.ForeignKey('Ad', on_delete=models.CASCADE, related_name='daily_stats')
+    impressions = models.PositiveIntegerField(default=0)
+    clicks = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'ad'], name='ad_daily_stats_uniq'),
+        ]
+
+
+class RollupCursor(models.Model):
+    """Last event-stream segment rolled up, per stream — counts ke saath hi commit hota hai."""
+    name = models.CharField(max_length=50, primary_key=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class PromptSignature(models.Model):
+    """MinHash signature of prompt_text (prompts_app/dedup.py) — Prompt rows halke rahein isliye alag."""
+    prompt = models.OneToOneField(Prompt, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    minhash = models.BinaryField()
+
+
+class PromptLSHBucket(models.Model):
+    """One row per (prompt, LSH band): same (band, bucket) = near-duplicate candidate."""
+    id = models.BigAutoField(primary_key=True)
+    prompt = models.ForeignKey(Prompt, on_delete=models.CASCADE, related_name='lsh_buckets')
+    band = models.SmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['band', 'bucket'], name='prompt_lsh_bucket_idx'),
+        ]
 
 
 class Ad(models.Model):
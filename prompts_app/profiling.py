@@ -0,0 +1,152 @@
+# prompts_app/profiling.py - Opt-in cProfile sampling for hot views
+#
+# PROFILING_ENABLED=False (default) pe middleware MiddlewareNotUsed raise karta
+# hai, yani request path mein ek bhi extra call nahi. Enabled hone par:
+#   - PROFILING_VIEWS ke requests mein se PROFILING_SAMPLE_RATE fraction profile hota hai
+#   - `X-Profile: <PROFILING_TOKEN>` header kisi bhi request ko force-profile karta hai
+# Har profile ka top-N (cumulative time) PROFILING_DIR/<view>/ mein ring ki tarah
+# save hota hai (sirf last PROFILING_RING_SIZE files), aur admin endpoint merged
+# profile download karwata hai.
+
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import random
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .metrics import view_name
+
+
+# cProfile ek time pe ek hi (Python 3.12+ mein globally) — busy ho to sample skip
+_profiler_lock = threading.Lock()
+
+
+def _view_dir(view):
+    return os.path.join(str(settings.PROFILING_DIR), re.sub(r'[^A-Za-z0-9_]', '_', view))
+
+
+def _trim(stats, top_n):
+    """Keep only the top-N functions by cumulative time (callers bhi unhi tak)."""
+    keep = set(sorted(stats, key=lambda f: stats[f][3], reverse=True)[:top_n])
+    return {
+        func: (cc, nc, tt, ct, {c: v for c, v in callers.items() if c in keep})
+        for func, (cc, nc, tt, ct, callers) in stats.items()
+        if func in keep
+    }
+
+
+def save_profile(view, profiler):
+    profiler.create_stats()
+    stats = _trim(profiler.stats, settings.PROFILING_TOP_N)
+
+    directory = _view_dir(view)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{time.time_ns()}-{os.getpid()}.prof')
+    with open(f'{path}.tmp', 'wb') as fh:
+        marshal.dump(stats, fh)
+    os.replace(f'{path}.tmp', path)
+
+    # Ring: purani files hatao
+    files = sorted(f for f in os.listdir(directory) if f.endswith('.prof'))
+    for old in files[:-settings.PROFILING_RING_SIZE]:
+        try:
+            os.remove(os.path.join(directory, old))
+        except FileNotFoundError:
+            pass  # doosre worker ne pehle hi hata di
+
+
+def merged_stats(view):
+    directory = _view_dir(view)
+    if not os.path.isdir(directory):
+        return None
+    paths = sorted(
+        os.path.join(directory, f) for f in os.listdir(directory) if f.endswith('.prof')
+    )
+    stats = None
+    for path in paths:
+        try:
+            if stats is None:
+                stats = pstats.Stats(path, stream=io.StringIO())
+            else:
+                stats.add(path)
+        except (OSError, ValueError, EOFError, TypeError):
+            continue  # rotate ho gayi ya aadhi likhi file
+    return stats
+
+
+# ===================== MIDDLEWARE =====================
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.views = set(settings.PROFILING_VIEWS)
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.token = settings.PROFILING_TOKEN
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        profiler = getattr(request, '_profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
+            save_profile(request._profiler_view, profiler)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = view_name(view_func)
+        forced = bool(self.token) and request.headers.get('X-Profile') == self.token
+        if not forced and (view not in self.views or random.random() >= self.sample_rate):
+            return None
+        if not _profiler_lock.acquire(blocking=False):
+            return None
+
+        # View + DRF render dono profile honge; __call__ mein band hota hai
+        request._profiler = cProfile.Profile()
+        request._profiler_view = view
+        request._profiler.enable()
+        return None
+
+
+# ===================== ADMIN DOWNLOAD =====================
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def download_profile(request):
+    """
+    GET /api/admin/profiles/                      → views jinke profiles hain
+    GET /api/admin/profiles/?view=PromptList      → merged top-N text report
+    GET /api/admin/profiles/?view=PromptList&download=1 → merged pstats dump
+                                                      (snakeviz / pstats mein kholo)
+    """
+    view = request.query_params.get('view')
+    if not view:
+        root = str(settings.PROFILING_DIR)
+        views = sorted(os.listdir(root)) if os.path.isdir(root) else []
+        return Response({"views": views})
+
+    stats = merged_stats(view)
+    if stats is None or not stats.stats:
+        return Response({"error": f"No profiles recorded for {view}"}, status=404)
+
+    if request.query_params.get('download'):
+        response = HttpResponse(marshal.dumps(stats.stats), content_type='application/octet-stream')
+        response['Content-Disposition'] = f'attachment; filename="{os.path.basename(_view_dir(view))}.prof"'
+        return response
+
+    out = io.StringIO()
+    stats.stream = out
+    stats.sort_stats('cumulative').print_stats(settings.PROFILING_TOP_N)
+    return HttpResponse(out.getvalue(), content_type='text/plain; charset=utf-8')
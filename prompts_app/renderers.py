@@ -0,0 +1,115 @@
+# prompts_app/renderers.py - Compact response formats via content negotiation
+#
+# Feed / favourites / batch pages mein har prompt apni saari keys aur poora
+# category_data + category_slug dohrata hai. Opt-in, `Accept` header se:
+#
+#   Accept: application/msgpack                     # MessagePack, wahi shape
+#   Accept: application/json; layout=columnar       # JSON, columnar page
+#   Accept: application/msgpack; layout=columnar    # dono
+#
+# (`?format=msgpack` / `?layout=columnar` bhi chalta hai — browser/curl ke liye.)
+#
+# Columnar: page ki prompt list (`results`) ban jaati hai
+#   {"layout": "columnar", "categories": [{...}, ...],
+#    "columns": {"id": [...], "title": [...], "category": [0, 0, 1, ...], ...}}
+# — har key ek baar, category object ek baar aur rows mein uska index;
+# category_slug hata (categories[i].slug). Baaki envelope (count, next, ...) same.
+# Default Accept (application/json, */*) pe output pehle jaisa.
+#
+# msgpack optional dependency hai: install na ho to renderer list mein nahi
+# aata aur sab JSON hi milta hai.
+
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+from rest_framework.utils.mediatypes import _MediaType
+
+try:
+    import msgpack
+except ImportError:   # optional
+    msgpack = None
+
+COLUMNAR = 'columnar'
+
+
+def to_columnar(items):
+    """List of serialized prompts → shared categories + one list per field."""
+    fields = {}
+    for item in items:
+        for key in item:
+            fields.setdefault(key, None)
+    if 'category_data' in fields:
+        fields.pop('category_slug', None)
+
+    categories, positions = [], {}
+    columns = {('category' if field == 'category_data' else field): [] for field in fields}
+    for item in items:
+        for field in fields:
+            value = item.get(field)
+            if field == 'category_data':
+                if value is not None:
+                    key = value.get('id', value.get('slug'))
+                    if key not in positions:
+                        positions[key] = len(categories)
+                        categories.append(value)
+                    value = positions[key]
+                field = 'category'
+            columns[field].append(value)
+    return {'layout': COLUMNAR, 'categories': categories, 'columns': columns}
+
+
+def _is_rows(value):
+    return isinstance(value, list) and all(isinstance(item, dict) for item in value)
+
+
+def compact(data, accepted_media_type, renderer_context):
+    """Apply the requested layout; non-list payloads (errors, bulk results) unchanged."""
+    renderer_context = renderer_context or {}
+    response = renderer_context.get('response')
+    if response is not None:
+        patch_vary_headers(response, ['Accept'])
+
+    layout = _MediaType(accepted_media_type or '').params.get('layout')
+    request = renderer_context.get('request')
+    if layout is None and request is not None:
+        layout = request.query_params.get('layout')
+    if layout != COLUMNAR:
+        return data
+
+    if isinstance(data, dict) and _is_rows(data.get('results')):
+        return {**data, 'results': to_columnar(data['results'])}
+    if _is_rows(data):
+        return to_columnar(data)
+    return data
+
+
+class CompactJSONRenderer(JSONRenderer):
+    """JSON; `layout=columnar` media type param switches the page layout."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        data = compact(data, accepted_media_type, renderer_context)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    # UUID / datetime / Decimal / lazy strings — bilkul JSON output jaise
+    _default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        data = compact(data, accepted_media_type, renderer_context)
+        return msgpack.packb(data, default=self._default, use_bin_type=True)
+
+
+# PromptList / favourites / batch / bulk views: JSON pehla (default), phir
+# msgpack, phir baaki defaults (browsable API, jab API_ONLY nahi)
+COMPACT_RENDERER_CLASSES = [CompactJSONRenderer] + ([MessagePackRenderer] if msgpack else []) + [
+    renderer for renderer in api_settings.DEFAULT_RENDERER_CLASSES if renderer is not JSONRenderer
+]
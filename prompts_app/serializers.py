@@ -1,7 +1,7 @@
 # prompts_app/serializers.py - COMPLETE FIXED VERSION
 
 from rest_framework import serializers
-from .models import Category, Prompt, PromptLike, Ad, AdmobConfig
+from .models import Category, Prompt, PromptImage, PromptLike, Ad, AdmobConfig
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -15,6 +15,12 @@ class CategorySerializer(serializers.ModelSerializer):
         return obj.prompts.count()
 
 
+class PromptImageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PromptImage
+        fields = ['width', 'height', 'placeholder', 'thumbnails']
+
+
 class PromptSerializer(serializers.ModelSerializer):
     category = serializers.PrimaryKeyRelatedField(
         queryset=Category.objects.all(),
@@ -30,25 +36,51 @@ class PromptSerializer(serializers.ModelSerializer):
         max_length=500
     )
 
+    # Processed thumbnails / size hints; null jab tak image process nahi hui
+    image = serializers.SerializerMethodField()
+
     like_count = serializers.IntegerField(source='likes.count', read_only=True)
     is_liked = serializers.SerializerMethodField()
 
     class Meta:
         model = Prompt
         fields = [
-            'id', 'title', 'prompt_text', 'image_url',
+            'id', 'title', 'prompt_text', 'image_url', 'image',
             'category', 'category_data', 'category_slug',
             'tags', 'is_premium', 'usage_count',
             'like_count', 'is_liked', 'created_at'
         ]
 
+    def get_image(self, obj):
+        try:
+            return PromptImageSerializer(obj.image).data
+        except PromptImage.DoesNotExist:
+            return None
+
     def get_is_liked(self, obj):
-        device_id = self.context.get('device_id')
-        if device_id:
-            return obj.likes.filter(device_id=device_id).exists()
+        device_pk = self.context.get('device_pk')   # devices.resolve_device() se
+        if device_pk:
+            return obj.likes.filter(device_id=device_pk).exists()
         return False
 
 
+class PromptBulkUpdateSerializer(serializers.ModelSerializer):
+    """One item of a bulk update: `id` + jo fields badalne hain (partial)."""
+    id = serializers.UUIDField()
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), required=False)
+    image_url = serializers.URLField(required=False, allow_blank=True, allow_null=True, max_length=500)
+
+    class Meta:
+        model = Prompt
+        fields = ['id', 'title', 'prompt_text', 'image_url', 'category', 'tags', 'is_premium']
+
+    def validate(self, data):
+        # partial=True sirf badalne wale fields optional karta hai — id nahi
+        if 'id' not in data:
+            raise serializers.ValidationError({'id': 'This field is required.'})
+        return data
+
+
 class AdSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ad
@@ -0,0 +1,223 @@
+# prompts_app/snapshots.py - Pre-rendered static feed snapshots
+#
+# build_snapshots() category list, ads, AdMob config aur har category (+ "all")
+# ke pehle SNAPSHOT_PAGES feed pages ko JSON files mein render karta hai:
+#
+#   SNAPSHOT_ROOT/v<hash>/categories.json
+#   SNAPSHOT_ROOT/v<hash>/ads.json
+#   SNAPSHOT_ROOT/v<hash>/admob.json
+#   SNAPSHOT_ROOT/v<hash>/feed/<slug>/p<n>.json      (+ .gz har file ke saath)
+#   SNAPSHOT_ROOT/manifest.json                      → /api/snapshots/manifest/
+#
+# Version content hash hai, isliye files immutable hain aur
+# SnapshotWhiteNoiseMiddleware unhe `max-age=forever, immutable` ke saath
+# serve karta hai — cold start pe Django/DRF/cache kuch nahi chalta.
+# Admin writes ke baad request_rebuild() background queue (prompts_app/tasks.py)
+# pe naya version banata hai.
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import tasks
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def _feed_payloads(slug, pages, base_url):
+    from .models import Prompt
+    from .serializers import PromptSerializer
+    from .views import PromptPagination
+
+    queryset = (
+        Prompt.objects
+        .select_related('category', 'image')
+        .prefetch_related('likes')
+        .order_by('-created_at')
+    )
+    if slug != 'all':
+        queryset = queryset.filter(category__slug=slug)
+
+    paginator = Paginator(queryset, PromptPagination.page_size)
+    last = min(pages, paginator.num_pages)
+
+    def link(n):
+        if n < 1 or n > paginator.num_pages:
+            return None
+        if n <= last:
+            return f'{base_url}feed/{slug}/p{n}.json'
+        return f'/api/prompts/?category={slug}&page={n}'
+
+    for n in range(1, last + 1):
+        page = paginator.page(n)
+        yield f'feed/{slug}/p{n}.json', {
+            'count':    paginator.count,
+            'next':     link(n + 1),
+            'previous': link(n - 1),
+            'results':  PromptSerializer(page.object_list, many=True).data,
+        }
+
+
+def render_payloads(pages, base_url):
+    from .models import Category
+    from .views import build_active_ads, build_admob_config, build_category_list
+
+    payloads = {
+        'categories.json': build_category_list(),
+        'ads.json': build_active_ads(),
+        'admob.json': build_admob_config(),
+    }
+    for slug in ['all'] + list(Category.objects.order_by('order').values_list('slug', flat=True)):
+        payloads.update(_feed_payloads(slug, pages, base_url))
+
+    renderer = JSONRenderer()
+    return {path: renderer.render(data) for path, data in payloads.items()}
+
+
+def _write_atomic(path, content):
+    with open(f'{path}.tmp', 'wb') as fh:
+        fh.write(content)
+    os.replace(f'{path}.tmp', path)
+
+
+def build_snapshots(pages=None):
+    """Render a new snapshot version (if content changed) and point the manifest at it."""
+    from .views import PromptPagination
+
+    pages = pages or settings.SNAPSHOT_PAGES
+    root = str(settings.SNAPSHOT_ROOT)
+    os.makedirs(root, exist_ok=True)
+
+    # Links version pe depend karte hain aur version content pe — isliye pehle
+    # placeholder ke saath hash nikalo, phir asli base_url se render karo
+    placeholder = render_payloads(pages, '@@base@@')
+    digest = hashlib.sha1()
+    for path in sorted(placeholder):
+        digest.update(path.encode())
+        digest.update(placeholder[path])
+    version = digest.hexdigest()[:12]
+    base_url = f'{settings.SNAPSHOT_URL_PREFIX}v{version}/'
+
+    version_dir = os.path.join(root, f'v{version}')
+    files = {
+        path: content.replace(b'@@base@@', base_url.encode())
+        for path, content in placeholder.items()
+    }
+    total_bytes = sum(len(c) for c in files.values())
+
+    if not os.path.isdir(version_dir):
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=root)
+        for path, content in files.items():
+            full = os.path.join(staging, path)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, 'wb') as fh:
+                fh.write(content)
+            with open(f'{full}.gz', 'wb') as fh:
+                fh.write(gzip.compress(content, compresslevel=9, mtime=0))
+        try:
+            os.rename(staging, version_dir)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)  # doosre worker ne same version bana diya
+
+    manifest = {
+        'version': version,
+        'base_url': base_url,
+        'generated_at': timezone.now().isoformat(),
+        'page_size': PromptPagination.page_size,
+        'pages': pages,
+        'files': sorted(files),
+    }
+    _write_atomic(os.path.join(root, MANIFEST_NAME), json.dumps(manifest).encode())
+    _prune(root, keep=settings.SNAPSHOT_KEEP_VERSIONS, current=f'v{version}')
+    return manifest, total_bytes
+
+
+def _prune(root, keep, current):
+    versions = [
+        d for d in os.listdir(root)
+        if d.startswith('v') and os.path.isdir(os.path.join(root, d))
+    ]
+    versions.sort(key=lambda d: os.path.getmtime(os.path.join(root, d)), reverse=True)
+    for old in versions[keep:]:
+        if old != current:
+            shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+
+
+def read_manifest():
+    try:
+        with open(os.path.join(str(settings.SNAPSHOT_ROOT), MANIFEST_NAME)) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+# ===================== REBUILD AFTER ADMIN WRITES =====================
+
+def request_rebuild():
+    """Commit ke baad background queue pe snapshots dobara banao (bursts ek 'snapshots' key mein coalesce)."""
+    if settings.SNAPSHOTS_ENABLED:
+        tasks.submit('snapshots', build_snapshots)
+
+
+# ===================== STATIC SERVING =====================
+
+class SnapshotWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise jo SNAPSHOT_URL_PREFIX ke neeche SNAPSHOT_ROOT aur
+    THUMBNAIL_URL_PREFIX ke neeche THUMBNAIL_ROOT (prompts_app/images.py) bhi
+    serve karta hai. Dono boot ke baad bante hain, isliye files pehli request
+    pe dhoondh ke yaad rakhi jaati hain (startup scan pe depend nahi).
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        # super().__init__ static files scan karte waqt immutable_file_test chalata hai
+        # (prefix, root, allowed suffixes) — dono content-addressed/versioned hain
+        self.generated = [
+            (settings.SNAPSHOT_URL_PREFIX, os.path.abspath(str(settings.SNAPSHOT_ROOT)) + os.path.sep, ('.json',)),
+            (settings.THUMBNAIL_URL_PREFIX, os.path.abspath(str(settings.THUMBNAIL_ROOT)) + os.path.sep, ('.webp',)),
+        ]
+        super().__init__(get_response, settings=settings)
+
+    def _mount(self, url):
+        for mount in self.generated:
+            if url.startswith(mount[0]):
+                return mount
+        return None
+
+    def __call__(self, request):
+        url = request.path_info
+        mount = self._mount(url)
+        if mount is None:
+            return super().__call__(request)
+
+        static_file = self.files.get(url) or self._find_generated(url, *mount)
+        if static_file is not None:
+            try:
+                return self.serve(static_file, request)
+            except FileNotFoundError:
+                self.files.pop(url, None)  # prune ho chuka version
+        return self.get_response(request)
+
+    def _find_generated(self, url, prefix, root, suffixes):
+        if not url.endswith(suffixes) or not self.url_is_canonical(url):
+            return None
+        path = os.path.join(root, url[len(prefix):])
+        if not self.path_is_child_of(path, root) or not os.path.isfile(path):
+            return None
+        static_file = self.get_static_file(path, url)
+        self.files[url] = static_file
+        return static_file
+
+    def immutable_file_test(self, path, url):
+        if self._mount(url) is not None:
+            return True  # versioned / content-hash dir — content kabhi nahi badalta
+        return super().immutable_file_test(path, url)
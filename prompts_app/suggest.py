@@ -0,0 +1,186 @@
+# prompts_app/suggest.py - In-memory typeahead index for /api/search/suggest/
+#
+# Titles (har word se shuru hone wala suffix), tags aur category names ek
+# sorted term list mein; prefix ki range bisect se milti hai aur usme se
+# usage_count weight ke hisaab se top-N. 1-2 letter prefixes (jinki range
+# bahut badi hoti hai) ke top-N build time pe hi nikaal ke rakhe jaate hain.
+#
+# Request path DB ko chhoota nahi. Prompt/category writes bump_version()
+# call karte hain; har worker SUGGEST_VERSION_CHECK seconds mein ek baar
+# shared cache ka version dekhta hai aur badla ho to background mein
+# rebuild karta hai (tab tak purana index). usage_count ke .update() version
+# nahi badalte, isliye weights SUGGEST_MAX_AGE ke baad bhi rebuild hote hain.
+
+import heapq
+import logging
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'suggest:version'
+PRECOMPUTED_PREFIX_LEN = 2
+SCAN_LIMIT = 2000          # isse badi range ho to precomputed / bounded scan
+MAX_TERM_LEN = 48          # title suffix terms itne chars tak (memory)
+
+_word_start = re.compile(r'(?:^|(?<=\s))\S')
+
+
+def normalize(text):
+    return ' '.join(text.casefold().split())
+
+
+def bump_version():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def request_refresh():
+    """Prompt/category write ke commit ke baad sab workers ko rebuild ka signal."""
+    transaction.on_commit(bump_version)
+
+
+class SuggestIndex:
+    def __init__(self, entries, max_results):
+        # entries: (term, item) ; item: (weight, type, text, ref pairs).
+        # Same type + text (jaise do prompts ka ek hi title) ek suggestion — bhaari wala
+        self.items = []
+        item_ids = {}
+        pairs = []
+        for term, item in entries:
+            key = (item[1], normalize(item[2]))
+            if key in item_ids:
+                i = item_ids[key]
+                if item[0] > self.items[i][0]:
+                    self.items[i] = item
+            else:
+                i = item_ids[key] = len(self.items)
+                self.items.append(item)
+            pairs.append((term, i))
+        pairs.sort()
+        self.terms = [t for t, _ in pairs]
+        self.refs = [i for _, i in pairs]
+        self.max_results = max_results
+        self.precomputed = self._precompute()
+
+    def __len__(self):
+        return len(self.items)
+
+    def _top(self, item_ids, limit):
+        return heapq.nlargest(limit, set(item_ids), key=lambda i: self.items[i][0])
+
+    def _precompute(self):
+        groups = defaultdict(set)
+        for term, i in zip(self.terms, self.refs):
+            for n in range(1, PRECOMPUTED_PREFIX_LEN + 1):
+                if len(term) >= n:
+                    groups[term[:n]].add(i)
+        return {
+            prefix: self._top(ids, self.max_results)
+            for prefix, ids in groups.items()
+            if len(ids) > self.max_results
+        }
+
+    def suggest(self, query, limit):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        limit = min(limit, self.max_results)
+
+        if prefix in self.precomputed:
+            top = self.precomputed[prefix][:limit]
+        else:
+            lo = bisect_left(self.terms, prefix)
+            hi = bisect_left(self.terms, prefix + '\uffff', lo)
+            top = self._top(self.refs[lo:min(hi, lo + SCAN_LIMIT)], limit)
+
+        results = []
+        for i in top:
+            weight, kind, text, ref = self.items[i]
+            results.append({'text': text, 'type': kind, **dict(ref)})
+        return results
+
+
+def build_index():
+    from .models import Category, Prompt
+
+    entries = []
+    tag_weights = defaultdict(int)
+    tag_text = {}
+    category_weights = defaultdict(int)
+
+    rows = Prompt.objects.values_list('pk', 'title', 'tags', 'usage_count', 'category_id')
+    for pk, title, tags, usage, category_id in rows.iterator(chunk_size=5000):
+        norm = normalize(title)
+        item = (usage, 'title', title, (('prompt_id', str(pk)),))
+        for match in _word_start.finditer(norm):
+            entries.append((norm[match.start():match.start() + MAX_TERM_LEN], item))
+        for tag in (tags or '').split(','):
+            tag = tag.strip()
+            if tag:
+                tag_weights[normalize(tag)] += usage + 1
+                tag_text.setdefault(normalize(tag), tag)
+        category_weights[category_id] += usage + 1
+
+    for norm, weight in tag_weights.items():
+        entries.append((norm, (weight, 'tag', tag_text[norm], ())))
+
+    for category_id, name, slug in Category.objects.values_list('pk', 'name', 'slug'):
+        norm = normalize(name)
+        item = (category_weights[category_id], 'category', name, (('slug', slug),))
+        for match in _word_start.finditer(norm):
+            entries.append((norm[match.start():], item))
+
+    return SuggestIndex(entries, settings.SUGGEST_MAX_RESULTS)
+
+
+# ===================== PER-PROCESS STATE =====================
+
+class _State:
+    def __init__(self):
+        self.index = None
+        self.version = None
+        self.built_at = 0.0
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+
+_state = _State()
+
+
+def _rebuild(version):
+    try:
+        index = build_index()
+        _state.index, _state.version, _state.built_at = index, version, time.monotonic()
+    except Exception:
+        logger.exception('Suggest index rebuild failed')
+    finally:
+        _state.lock.release()
+        connections.close_all()   # thread ke apne connections
+
+
+def get_index():
+    """Current index; builds it synchronously only the very first time (boot)."""
+    now = time.monotonic()
+    if _state.index is None:
+        with _state.lock:
+            if _state.index is None:
+                _state.version = cache.get(VERSION_KEY)
+                _state.index, _state.built_at = build_index(), now
+                _state.checked_at = now
+        return _state.index
+
+    if now - _state.checked_at >= settings.SUGGEST_VERSION_CHECK:
+        _state.checked_at = now
+        version = cache.get(VERSION_KEY)
+        stale = version != _state.version or now - _state.built_at >= settings.SUGGEST_MAX_AGE
+        if stale and _state.lock.acquire(blocking=False):
+            threading.Thread(target=_rebuild, args=(version,), name='suggest-rebuild', daemon=True).start()
+    return _state.index
@@ -0,0 +1,161 @@
+# prompts_app/tasks.py - In-process background queue for post-write side effects
+#
+# Writes ke baad ka kaam (feed cache invalidation + re-warm, snapshot rebuild,
+# analytics flush/rollup) request mein nahi, commit ke baad ek chhote thread
+# pool (BACKGROUND_WORKERS) pe:
+#
+#   tasks.submit('snapshots', build)          # transaction.on_commit se enqueue
+#   tasks.submit('feed:coding', fn, on_commit=False)
+#
+# Coalescing by key: jo key queue mein pehle se hai uska naya submit usi ko
+# replace karta hai (das edits → ek rebuild). Har task pehle submit ke
+# BACKGROUND_COALESCE_DELAY baad chalta hai — burst ko jama hone ka mauka, aur
+# kaam response ke bache hisse ke saath GIL ke liye nahi ladta. Key chal rahi
+# ho to ek aur run uske khatam hone ke baad (beech ke writes miss na hon). Ek
+# key kabhi do threads pe ek saath nahi chalti.
+#
+# BACKGROUND_MAX_PENDING se zyada alag keys ho jaayein to naya kaam caller ke
+# thread pe inline chalta hai (backpressure, drop nahi). BACKGROUND_SYNC=True
+# (tests) pe sab inline. Gunicorn worker_exit / atexit pe drain().
+
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class WorkQueue:
+    def __init__(self, workers, max_pending, delay=0.0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.delay = delay
+        self.cond = threading.Condition()
+        self.pending = OrderedDict()   # key → [fn, ready_at] (FIFO by first submit)
+        self.running = set()
+        self.rerun = {}                # key → fn submitted while key was running
+        self.threads = []
+        self.draining = False
+        self.closed = False
+
+    def _ensure_threads(self):
+        # Lazily: gunicorn --preload ke fork ke baad threads child mein chahiye
+        self.threads = [t for t in self.threads if t.is_alive()]
+        while len(self.threads) < self.workers:
+            thread = threading.Thread(target=self._loop, name=f'background-{len(self.threads)}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, key, fn):
+        with self.cond:
+            if not self.closed:
+                if key in self.running:
+                    self.rerun[key] = fn
+                    return
+                if key in self.pending:
+                    self.pending[key][0] = fn   # ready_at wahi — lagataar submits se starve na ho
+                    return
+                if len(self.pending) < self.max_pending:
+                    self.pending[key] = [fn, time.monotonic() + self.delay]
+                    self._ensure_threads()
+                    self.cond.notify()
+                    return
+        logger.warning('Background queue full/closed, running %s inline', key)
+        _run(key, fn)
+
+    def _loop(self):
+        while True:
+            with self.cond:
+                while True:
+                    if self.pending:
+                        wait = next(iter(self.pending.values()))[1] - time.monotonic()
+                        if wait <= 0 or self.draining:
+                            break
+                        self.cond.wait(wait)
+                    else:
+                        self.cond.wait()
+                key, (fn, _) = self.pending.popitem(last=False)
+                self.running.add(key)
+            try:
+                _run(key, fn)
+            finally:
+                connections.close_all()   # is thread ke connections
+                with self.cond:
+                    self.running.discard(key)
+                    if key in self.rerun:
+                        self.pending[key] = [self.rerun.pop(key), time.monotonic() + self.delay]
+                    self.cond.notify_all()
+
+    def drain(self, timeout=None):
+        """Wait until nothing is pending or running; returns True if drained."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            self.draining = True   # coalesce delay ka intezaar mat karo
+            self.cond.notify_all()
+            while self.pending or self.running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.draining = False
+                    return False
+                self.cond.wait(remaining)
+            self.draining = False
+        return True
+
+    def close(self, timeout=None):
+        drained = self.drain(timeout)
+        with self.cond:
+            self.closed = True
+        return drained
+
+
+def _run(key, fn):
+    try:
+        fn()
+    except Exception:
+        logger.exception('Background task %s failed', key)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def _get_queue():
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = WorkQueue(
+                    settings.BACKGROUND_WORKERS, settings.BACKGROUND_MAX_PENDING,
+                    settings.BACKGROUND_COALESCE_DELAY,
+                )
+    return _queue
+
+
+def submit(key, fn, on_commit=True):
+    """Run `fn()` in the background, coalesced by `key`; by default only after the
+    current transaction commits (rollback = nothing runs)."""
+    if settings.BACKGROUND_SYNC:
+        def enqueue():
+            _run(key, fn)
+    else:
+        def enqueue():
+            _get_queue().submit(key, fn)
+    if on_commit:
+        transaction.on_commit(enqueue)
+    else:
+        enqueue()
+
+
+def drain(timeout=None):
+    """Shutdown: finish queued work (up to the timeout); later submits run inline."""
+    if _queue is None:
+        return True
+    return _queue.close(timeout if timeout is not None else settings.BACKGROUND_DRAIN_TIMEOUT)
+
+
+atexit.register(drain)
@@ -0,0 +1,220 @@
+# prompts_app/throttling.py - Token-bucket throttles for public hot paths
+#
+# LikeToggle, favourites, ?search= aur ad events AllowAny hain. Har view ka
+# `throttle_scope` REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] se rate leta hai
+# ("30/min" = 30 tokens ki bucket, 30/min refill). Do buckets:
+#   - device_id (query param ya body) — asli per-client limit
+#   - IP — rate x THROTTLE_IP_MULTIPLIER (NAT ke peeche kai devices), taaki
+#     device_id badal-badal ke limit na todi ja sake. IP = DRF get_ident(),
+#     NUM_PROXIES (settings) ke hisaab se X-Forwarded-For ka proxy-added hop —
+#     client ka forged header nahi.
+# Dono ek saath check hote hain; koi bhi khaali ho to 429 + Retry-After.
+# DRF throttles view ke initial() mein chalte hain — handler/ORM se pehle.
+#
+# Bucket = GCRA (har key ka sirf ek "theoretical arrival time"):
+#   - Redis (REDIS_URL): ek Lua script, saare workers ke beech atomic
+#   - Redis nahi, L2 = SharedFileCache: `<CACHE_DIR>/throttle` mein alag
+#     SharedFileCache (device/IP keys ka cull analytics segments na uda de),
+#     uske flock (_atomic) ke andar get_many → GCRA → set_many; ek host ke
+#     saare workers ek hi bucket
+#   - warna (LocMem L2 / THROTTLE_BACKEND=local) process ke andar (lock +
+#     bounded dict) — tab asli limit = rate x gunicorn workers
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+LOCAL_MAX_KEYS = 50000
+FILE_MAX_KEYS = 50000
+
+_GCRA_LUA = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local updates = {}
+for i, key in ipairs(KEYS) do
+    local interval = tonumber(ARGV[i * 2])
+    local burst = tonumber(ARGV[i * 2 + 1])
+    local tat = tonumber(redis.call('GET', key) or now)
+    if tat < now then tat = now end
+    local new_tat = tat + interval
+    if new_tat - now > burst then
+        wait = math.max(wait, new_tat - now - burst)
+    end
+    updates[i] = new_tat
+end
+if wait > 0 then return tostring(wait) end
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, tostring(updates[i]), 'PX', math.ceil((updates[i] - now) * 1000))
+end
+return '0'
+"""
+
+
+class LocalBuckets:
+    """In-process GCRA buckets; `consume()` is atomic within this process only."""
+
+    def __init__(self, max_keys=LOCAL_MAX_KEYS):
+        self.max_keys = max_keys
+        self.tats = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, buckets, now):
+        with self.lock:
+            updates = []
+            wait = 0.0
+            for key, interval, burst in buckets:
+                new_tat = max(self.tats.get(key, now), now) + interval
+                if new_tat - now > burst:
+                    wait = max(wait, new_tat - now - burst)
+                updates.append((key, new_tat))
+            if wait:
+                return wait
+            for key, new_tat in updates:
+                self.tats[key] = new_tat
+                self.tats.move_to_end(key)
+            while len(self.tats) > self.max_keys:
+                self.tats.popitem(last=False)
+            return 0.0
+
+
+class RedisBuckets:
+    """GCRA buckets in the shared Redis cache via one Lua call."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.script = backend._cache.get_client(write=True).register_script(_GCRA_LUA)
+
+    def consume(self, buckets, now):
+        keys = [self.backend.make_and_validate_key(key) for key, _, _ in buckets]
+        args = [now]
+        for _, interval, burst in buckets:
+            args += [interval, burst]
+        return float(self.script(keys=keys, args=args))
+
+
+class FileBuckets:
+    """GCRA buckets in the SharedFileCache L2, read-modify-write under its flock."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def consume(self, buckets, now):
+        keys = [key for key, _, _ in buckets]
+        with self.backend._atomic():
+            tats = self.backend.get_many(keys)
+            updates = {}
+            wait = 0.0
+            for key, interval, burst in buckets:
+                new_tat = max(tats.get(key, now), now) + interval
+                if new_tat - now > burst:
+                    wait = max(wait, new_tat - now - burst)
+                updates[key] = new_tat
+            if wait:
+                return wait
+            # Bucket bhar jaane (new_tat <= now) ke baad key ki zaroorat nahi
+            timeout = math.ceil(max(updates.values()) - now) + 1
+            self.backend.set_many(updates, timeout)
+            return 0.0
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _l2():
+    return getattr(cache, 'l2', cache)   # TieredCache → asli L2
+
+
+def _redis_cache():
+    from django.core.cache.backends.redis import RedisCache
+
+    backend = _l2()
+    return backend if isinstance(backend, RedisCache) else None
+
+
+def _file_cache():
+    from .cache_backends import SharedFileCache
+
+    backend = _l2()
+    if not isinstance(backend, SharedFileCache):
+        return None
+    return SharedFileCache(os.path.join(backend._dir, 'throttle'), {'OPTIONS': {'MAX_ENTRIES': FILE_MAX_KEYS}})
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                choice = settings.THROTTLE_BACKEND
+                redis = _redis_cache() if choice in ('auto', 'redis') else None
+                files = _file_cache() if choice in ('auto', 'file') and redis is None else None
+                if redis is not None:
+                    _backend = RedisBuckets(redis)
+                elif files is not None:
+                    _backend = FileBuckets(files)
+                else:
+                    _backend = LocalBuckets()
+    return _backend
+
+
+_parsed_rates = {}
+
+
+def _rate(scope):
+    """'30/min' → (seconds per token, bucket depth in seconds)."""
+    rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+    if rate not in _parsed_rates:
+        num, period = rate.split('/')
+        duration = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+        _parsed_rates[rate] = (duration / int(num), float(duration))
+    return _parsed_rates[rate]
+
+
+def _device_id(request):
+    device_id = request.query_params.get('device_id')
+    if not device_id and request.method not in ('GET', 'HEAD', 'DELETE'):
+        data = request.data
+        device_id = data.get('device_id') if isinstance(data, dict) else None
+    return str(device_id)[:255] if device_id else None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Per-device + per-IP token bucket for `view.throttle_scope`."""
+
+    def get_scope(self, request, view):
+        return getattr(view, 'throttle_scope', None)
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        if not settings.THROTTLE_ENABLED or scope is None:
+            return True
+
+        interval, burst = _rate(scope)
+        buckets = [(f'throttle:{scope}:ip:{self.get_ident(request)}',
+                    interval / settings.THROTTLE_IP_MULTIPLIER, burst)]
+        device_id = _device_id(request)
+        if device_id:
+            digest = hashlib.sha1(device_id.encode()).hexdigest()
+            buckets.append((f'throttle:{scope}:device:{digest}', interval, burst))
+
+        self.wait_seconds = get_backend().consume(buckets, time.time())
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class SearchThrottle(TokenBucketThrottle):
+    """Only `?search=` requests of a list view (cached feed pages stay unthrottled)."""
+
+    def get_scope(self, request, view):
+        return 'search' if request.query_params.get('search') else None
@@ -2,11 +2,17 @@
 
 from django.urls import path
 from . import views
+from .profiling import download_profile
 
 urlpatterns = [
     # Public APIs
+    path('home/', views.HomeBundleView.as_view(), name='home-bundle'),
     path('categories/', views.CategoryList.as_view(), name='category-list'),
+    path('snapshots/manifest/', views.SnapshotManifestView.as_view(), name='snapshot-manifest'),
     path('prompts/', views.PromptList.as_view(), name='prompt-list'),
+    path('prompts/batch/', views.PromptBatchView.as_view(), name='prompt-batch'),
+    path('search/suggest/', views.SearchSuggestView.as_view(), name='search-suggest'),
+    path('prompts/changes/', views.PromptChanges.as_view(), name='prompt-changes'),
     path('prompts/<uuid:pk>/', views.PromptDetail.as_view(), name='prompt-detail'),
 
     # Device-based Features
@@ -18,7 +24,12 @@ urlpatterns = [
     path('admin/prompts/create/', views.PromptCreateView.as_view(), name='prompt-create'),
     path('admin/prompts/<uuid:pk>/update/', views.PromptUpdateView.as_view(), name='prompt-update'),
     path('admin/prompts/<uuid:pk>/delete/', views.PromptDeleteView.as_view(), name='prompt-delete'),
+    path('admin/prompts/<uuid:pk>/image/', views.PromptImageUploadView.as_view(), name='prompt-image'),
+    path('admin/prompts/bulk/create/', views.PromptBulkCreateView.as_view(), name='prompt-bulk-create'),
+    path('admin/prompts/bulk/update/', views.PromptBulkUpdateView.as_view(), name='prompt-bulk-update'),
+    path('admin/prompts/bulk/delete/', views.PromptBulkDeleteView.as_view(), name='prompt-bulk-delete'),
     path('ads/active/', views.ActiveAdsView.as_view(), name='active-ads'),
+    path('ads/events/', views.AdEventsView.as_view(), name='ad-events'),
     path('admob-config/', views.AdmobConfigPublicView.as_view(), name='admob-config-public'),
     path('admob-config/admin/', views.AdmobConfigAdminView.as_view(), name='admob-config-admin'),
     # prompts_app/urls.py (end mein add kar do)
@@ -31,6 +42,13 @@ urlpatterns = [
     # Add this line
     path('admin/change-credentials/', views.change_admin_credentials, name='change-credentials'),
 
+    # Admin Only - merged cProfile dumps (PROFILING_ENABLED=True pe)
+    path('admin/profiles/', download_profile, name='profile-download'),
+
+    # Admin Only - view/like analytics (daily rollups)
+    path('admin/stats/', views.AdminStatsView.as_view(), name='admin-stats'),
+    path('admin/ads/stats/', views.AdminAdStatsView.as_view(), name='admin-ad-stats'),
+
     # Admin Only - Categories
     path('admin/categories/create/', views.CategoryCreateView.as_view(), name='category-create'),
     path('admin/categories/<uuid:id>/update/', views.CategoryUpdateView.as_view(), name='category-update'),
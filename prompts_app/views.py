@@ -2,26 +2,50 @@
 
 from rest_framework import generics, permissions
 from rest_framework.views import APIView
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.pagination import PageNumberPagination   # ← NEW
+from rest_framework.renderers import JSONRenderer
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.core.paginator import InvalidPage, Paginator
 from django.db import models, transaction
+from django.urls import reverse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from datetime import timedelta
+from datetime import datetime, timedelta
+from functools import partial
+from urllib.parse import urlencode
+import base64
+import hashlib
+import json
+import time
+import uuid
 
 from django.views.decorators.cache import cache_page
 from django.utils.decorators import method_decorator
 from django.core.cache import cache
 
-from .models import Category, Prompt, Favourite, PromptLike, Ad, AdmobConfig
+from . import analytics, dedup, images, metrics, suggest, tasks, write_queue
+from .authentication import bump_token_version
+from .cache_utils import get_many_or_build, get_or_build
+from .catalogue import get_snapshot
+from .db_router import pin_to_primary, primary_reads
+from .devices import resolve_device
+from .renderers import COMPACT_RENDERER_CLASSES
+from .snapshots import read_manifest, request_rebuild
+from .throttling import SearchThrottle, TokenBucketThrottle
+from .models import Category, Prompt, Favourite, PromptLike, Ad, AdmobConfig, DeletionLog
 from .serializers import (
     CategorySerializer,
     PromptSerializer,
+    PromptBulkUpdateSerializer,
     AdSerializer,
     AdCreateSerializer,
     AdmobConfigSerializer,
@@ -55,41 +79,43 @@ class CategoryList(generics.ListAPIView):
     queryset = Category.objects.prefetch_related('prompts').order_by('order')
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
+    replica_reads = True   # GET reads replica se (db_router)
 
     def list(self, request, *args, **kwargs):
-        cache_key = 'category_list'
-        cached = cache.get(cache_key)
-        if cached:
-            return Response(cached)
-
-        real_categories = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(real_categories, many=True)
-        real_data = serializer.data
-
-        total_prompts = Prompt.objects.count()
-
-        all_category = {
-            "id": "all",
-            "name": "All",
-            "slug": "all",
-            "order": -999,
-            "prompts_count": total_prompts,
-        }
+        return Response(
+            get_or_build('category_list', build_category_list, CACHE_TTL, family='category_list')
+        )
+
+
+def build_category_list():
+    real_categories = Category.objects.prefetch_related('prompts').order_by('order')
+    real_data = CategorySerializer(real_categories, many=True).data
+
+    total_prompts = Prompt.objects.count()
+
+    all_category = {
+        "id": "all",
+        "name": "All",
+        "slug": "all",
+        "order": -999,
+        "prompts_count": total_prompts,
+    }
 
-        final_data = [all_category] + list(real_data)
-        cache.set(cache_key, final_data, CACHE_TTL)
-        return Response(final_data)
+    return [all_category] + list(real_data)
 
 
 class PromptList(generics.ListAPIView):
     serializer_class = PromptSerializer
     permission_classes = [AllowAny]
+    renderer_classes = COMPACT_RENDERER_CLASSES  # Accept: application/msgpack / layout=columnar
+    throttle_classes = [SearchThrottle]
+    replica_reads = True
     pagination_class = PromptPagination          # ← PAGINATION ENABLE
 
     def get_queryset(self):
         queryset = (
             Prompt.objects
-            .select_related('category')
+            .select_related('category', 'image')
             .prefetch_related('likes')
             .order_by('-created_at')
         )
@@ -113,102 +139,393 @@ class PromptList(generics.ListAPIView):
         search    = request.query_params.get('search', '')
         page      = request.query_params.get('page', '1')
 
-        # Cache sirf page=1 ke liye (first load fast)
-        # Search results cache nahi honge
-        cache_key = f'prompts_{category}_{search}_p{page}' if not search else None
-
-        if cache_key:
-            cached = cache.get(cache_key)
-            if cached:
-                # is_liked inject karo cache se bhi
-                if device_id:
-                    import copy
-                    cached = copy.deepcopy(cached)
-                    liked_ids = set(
-                        PromptLike.objects
-                        .filter(device_id=device_id)
-                        .values_list('prompt_id', flat=True)
-                    )
-                    for p in cached.get('results', []):
-                        p['is_liked'] = str(p['id']) in {str(i) for i in liked_ids}
-                return Response(cached)
+        # Search aur custom page_size cache nahi hote. Cached page request-independent
+        # hai (relative links, is_liked=False); personalize_page() har request pe
+        # absolute links aur device ka is_liked lagata hai.
+        if search or request.query_params.get('page_size'):
+            data = self._build_page()
+        elif settings.CATALOGUE_ENABLED:
+            # In-memory catalogue ka slice cache se bhi sasta hai
+            data = build_feed_page(category, page)
+        else:
+            data = get_or_build(
+                f'prompts_{category}__p{page}', partial(build_feed_page, category, page),
+                CACHE_TTL, family='prompts',
+            )
 
-        queryset = self.filter_queryset(self.get_queryset())
+        return Response(personalize_page(data, request, device_id))
 
-        # Pagination apply karo
+    def _build_page(self):
+        queryset = self.filter_queryset(self.get_queryset())
         page_obj = self.paginate_queryset(queryset)
-        serializer = self.get_serializer(
-            page_obj, many=True,
-            context={'device_id': device_id},
-        )
-        data = serializer.data
-
-        # is_liked inject (live, non-cached)
-        if device_id:
-            liked_ids = set(
-                PromptLike.objects
-                .filter(device_id=device_id)
-                .values_list('prompt_id', flat=True)
-            )
-            for p in data:
-                p['is_liked'] = str(p['id']) in {str(i) for i in liked_ids}
+        serializer = self.get_serializer(page_obj, many=True)
+        return self.get_paginated_response(serializer.data).data
 
-        response = self.get_paginated_response(data)
 
-        # Cache karo (search ke liye nahi)
-        if cache_key:
-            cache.set(cache_key, response.data, CACHE_TTL)
+def build_feed_page(category, page):
+    """Default-size feed page without a request (get_or_build / cache warmer).
+    Links relative hain; personalize_page() unhe request ke host se poora karta hai."""
+    if settings.CATALOGUE_ENABLED:
+        object_list = get_snapshot().feed(category)   # rows pehle se serialized
+    else:
+        object_list = (
+            Prompt.objects
+            .select_related('category', 'image')
+            .prefetch_related('likes')
+            .order_by('-created_at')
+        )
+        if category != 'all':
+            object_list = object_list.filter(category__slug=category)
 
-        return response
+    paginator = Paginator(object_list, PromptPagination.page_size)
+    try:
+        page_obj = paginator.page(page)
+    except InvalidPage:
+        raise NotFound(PromptPagination.invalid_page_message)
+
+    def link(n):
+        params = {} if category == 'all' else {'category': category}
+        if n > 1:
+            params['page'] = n
+        query = urlencode(params)
+        return reverse('prompt-list') + (f'?{query}' if query else '')
+
+    return {
+        'count':    paginator.count,
+        'next':     link(page_obj.next_page_number()) if page_obj.has_next() else None,
+        'previous': link(page_obj.previous_page_number()) if page_obj.has_previous() else None,
+        'results':  (
+            list(page_obj.object_list) if settings.CATALOGUE_ENABLED
+            else PromptSerializer(page_obj.object_list, many=True).data
+        ),
+    }
+
+
+def personalize_page(data, request, device_id):
+    """Copy of a cached page with absolute links and, for a device, `is_liked` (one query)."""
+    links = {}
+    for link in ('next', 'previous'):
+        if data.get(link):
+            url = request.build_absolute_uri(data[link])
+            links[link] = replace_query_param(url, 'device_id', device_id) if device_id else url
+    if not device_id:
+        return {**data, **links}
+    return {**data, **links, 'results': overlay_is_liked(data.get('results', []), device_id)}
+
+
+def overlay_is_liked(prompts, device_id):
+    """Copies of serialized prompts with the device's `is_liked` (one query)."""
+    device_pk = resolve_device(device_id)
+    if not device_pk:
+        return [{**p, 'is_liked': False} for p in prompts]
+    liked_ids = {
+        str(i) for i in
+        PromptLike.objects.filter(
+            device_id=device_pk, prompt_id__in=[p['id'] for p in prompts]
+        ).values_list('prompt_id', flat=True)
+    }
+    return [{**p, 'is_liked': str(p['id']) in liked_ids} for p in prompts]
 
 
 class PromptDetail(generics.RetrieveAPIView):
-    queryset = Prompt.objects.select_related('category').prefetch_related('likes')
+    queryset = Prompt.objects.select_related('category', 'image').prefetch_related('likes')
     serializer_class = PromptSerializer
     lookup_field = 'pk'
     permission_classes = [AllowAny]
+    replica_reads = True
 
     def retrieve(self, request, *args, **kwargs):
         prompt = self.get_object()
-        Prompt.objects.filter(pk=prompt.pk).update(
-            usage_count=models.F('usage_count') + 1
-        )
+        write_queue.increment_usage(prompt.pk)
+        analytics.record_view(prompt)
         serializer = self.get_serializer(
             prompt,
-            context={'device_id': request.query_params.get('device_id')},
+            context={'device_pk': resolve_device(request.query_params.get('device_id'))},
         )
         return Response(serializer.data)
 
 
+FEED_CACHE_PAGES = 19
+
+
+def refresh_feed_cache(slug):
+    """Delete one category's cached feed pages (and re-warm the first few if CACHE_WARM_ON_WRITE)."""
+    keys = [f'prompts_{slug}__p{i}' for i in range(1, FEED_CACHE_PAGES + 1)]
+    cache.delete_many(keys)
+    metrics.record_invalidation('prompts', len(keys))
+    if settings.CACHE_WARM_ON_WRITE:
+        from .warmup import warm_feed
+        warm_feed(slug, settings.CACHE_WARM_PAGES)
+
+
+def schedule_feed_invalidation(category_slugs):
+    """Commit ke baad background mein (prompts_app/tasks.py); har category ki ek key,
+    to ek burst ke saare writes ek hi invalidation mein."""
+    for slug in set(category_slugs) | {'all'}:
+        tasks.submit(f'feed:{slug}', partial(refresh_feed_cache, slug))
+
+
+# ===================== BATCH DETAIL =====================
+
+PROMPT_DETAIL_KEY = 'prompt_detail:{}'
+BATCH_MAX_IDS = 100
+
+
+class PromptBatchView(APIView):
+    """
+    GET ?ids=a,b,c  ya  POST {"ids": [...]} (lambi lists) — BATCH_MAX_IDS tak
+    prompts, request ke order mein. Har prompt ki detail cache entry se; sirf
+    miss wale ids ki ek `pk__in` query. Na mile to {"id": ..., "not_found": true}.
+    Hydration "use" nahi hai, isliye usage_count nahi badhta.
+    """
+    permission_classes = [AllowAny]
+    renderer_classes = COMPACT_RENDERER_CLASSES
+    replica_reads = True
+
+    def get(self, request):
+        ids = [i for i in request.query_params.get('ids', '').split(',') if i]
+        return self._batch(request, ids, request.query_params.get('device_id'))
+
+    def post(self, request):
+        ids, error = _bulk_items(request.data, key='ids')
+        if error:
+            return error
+        return self._batch(request, ids, request.data.get('device_id'))
+
+    def _batch(self, request, ids, device_id):
+        if not ids:
+            return Response({"error": "ids required"}, status=400)
+        if len(ids) > BATCH_MAX_IDS:
+            return Response({"error": f"Max {BATCH_MAX_IDS} ids per request"}, status=400)
+        try:
+            ids = [str(pk) for pk in serializers.ListField(child=serializers.UUIDField()).run_validation(ids)]
+        except serializers.ValidationError as e:
+            return Response({"errors": e.detail}, status=400)
+
+        keys = {pk: PROMPT_DETAIL_KEY.format(pk) for pk in ids}
+        cached = cache.get_many(list(set(keys.values())))
+        found = {pk: cached[key] for pk, key in keys.items() if key in cached}
+        for pk in keys:
+            metrics.record_cache('prompt_detail', pk in found)
+
+        missing = [pk for pk in keys if pk not in found]
+        if missing:
+            prompts = (
+                Prompt.objects
+                .filter(pk__in=missing)
+                .select_related('category', 'image')
+                .prefetch_related('likes')
+            )
+            with primary_reads():   # shared cache fill — replica lag nahi
+                fresh = {p['id']: p for p in PromptSerializer(prompts, many=True).data}
+            cache.set_many({keys[pk]: data for pk, data in fresh.items()}, CACHE_TTL)
+            found.update(fresh)
+
+        if device_id and found:
+            found = {p['id']: p for p in overlay_is_liked(list(found.values()), device_id)}
+        return Response({
+            'results': [found.get(pk) or {'id': pk, 'not_found': True} for pk in ids],
+        })
+
+
+# ===================== SEARCH SUGGEST =====================
+
+class SearchSuggestView(APIView):
+    """?q=<prefix>&limit=N — in-memory index se titles/tags/categories, DB nahi."""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            limit = 10
+
+        start = time.perf_counter()
+        suggestions = suggest.get_index().suggest(query, max(1, limit))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        response = Response({'q': query, 'suggestions': suggestions})
+        response['Server-Timing'] = f'suggest;dur={elapsed_ms:.3f}'
+        response['Cache-Control'] = 'public, max-age=60'
+        return response
+
+
+# ===================== DELTA SYNC =====================
+
+SYNC_PAGE_SIZE = 100
+SYNC_MAX_PAGE_SIZE = 500
+# Is se naye rows abhi nahi bheje jaate — late-commit hone wali transaction ka
+# row cursor ke peeche na chhoot jaye
+SYNC_SAFETY_LAG = timedelta(seconds=5)
+
+
+def _encode_sync_token(updated_at, prompt_id, deletion_id):
+    payload = {
+        'u': updated_at.isoformat() if updated_at else None,
+        'i': str(prompt_id) if prompt_id else None,
+        'd': deletion_id,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def _decode_sync_token(token):
+    if not token:
+        return None, None, 0
+    padded = token + '=' * (-len(token) % 4)
+    payload = json.loads(base64.urlsafe_b64decode(padded))
+    updated_at = datetime.fromisoformat(payload['u']) if payload['u'] else None
+    prompt_id = uuid.UUID(payload['i']) if payload['i'] else None
+    return updated_at, prompt_id, int(payload['d'])
+
+
+class PromptChanges(APIView):
+    """
+    GET /api/prompts/changes/?since=<token>&page_size=100
+
+    Created/updated prompts (keyset on updated_at, id) + deletion tombstones
+    since `token`. Pehli sync mein `since` mat bhejo. Jab tak `has_more` true
+    hai, `next_token` ke saath dobara call karo; last response ka `next_token`
+    save kar lo. Note: like_count/usage_count ke counter updates updated_at
+    nahi badalte, isliye woh yahan nahi aate.
+    """
+    permission_classes = [AllowAny]
+    replica_reads = True
+
+    def get(self, request):
+        try:
+            since_at, since_id, since_deletion = _decode_sync_token(request.query_params.get('since'))
+            limit = min(int(request.query_params.get('page_size', SYNC_PAGE_SIZE)), SYNC_MAX_PAGE_SIZE)
+        except (ValueError, KeyError, TypeError):
+            return Response({"error": "Invalid sync token"}, status=400)
+        limit = max(limit, 1)
+        horizon = timezone.now() - SYNC_SAFETY_LAG
+
+        prompts = Prompt.objects.select_related('category', 'image').filter(updated_at__lt=horizon)
+        if since_at is not None:
+            prompts = prompts.filter(
+                models.Q(updated_at__gt=since_at) |
+                models.Q(updated_at=since_at, id__gt=since_id)
+            )
+        prompts = list(prompts.order_by('updated_at', 'id')[:limit + 1])
+
+        deletions = list(
+            DeletionLog.objects
+            .filter(id__gt=since_deletion, deleted_at__lt=horizon)
+            .order_by('id')[:limit + 1]
+        )
+
+        has_more = len(prompts) > limit or len(deletions) > limit
+        prompts, deletions = prompts[:limit], deletions[:limit]
+
+        if prompts:
+            since_at, since_id = prompts[-1].updated_at, prompts[-1].id
+        if deletions:
+            since_deletion = deletions[-1].id
+
+        return Response({
+            'changed': PromptSerializer(prompts, many=True, context={'request': request}).data,
+            'deleted': [{'kind': d.kind, 'id': str(d.object_id)} for d in deletions],
+            'next_token': _encode_sync_token(since_at, since_id, since_deletion),
+            'has_more': has_more,
+        })
+
+
+# ===================== STATIC SNAPSHOTS =====================
+
+class SnapshotManifestView(APIView):
+    """Current snapshot version; files `base_url` ke neeche WhiteNoise se aate hain."""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        manifest = read_manifest()
+        if manifest is None:
+            return Response({"error": "No snapshot built yet"}, status=404)
+        response = Response(manifest)
+        response['Cache-Control'] = 'public, max-age=60'
+        return response
+
+
+# ===================== HOME BUNDLE =====================
+
+class HomeBundleView(APIView):
+    """
+    App cold start ke liye ek hi call: categories, feed ka pehla page, active
+    ads aur AdMob config — chaaron apni cache keys se ek get_many mein.
+    Device ka is_liked overlay upar se; poore body ka ek ETag (If-None-Match → 304).
+    """
+    permission_classes = [AllowAny]
+    replica_reads = True
+
+    def get(self, request):
+        device_id = request.query_params.get('device_id', '')
+        builds = {
+            'category_list': (build_category_list, 'category_list'),
+            'active_ads': (build_active_ads, 'ads'),
+            'admob_config': (build_admob_config, 'admob_config'),
+        }
+        if not settings.CATALOGUE_ENABLED:
+            builds['prompts_all__p1'] = (partial(build_feed_page, 'all', '1'), 'prompts')
+        parts = get_many_or_build(builds, CACHE_TTL)
+        if settings.CATALOGUE_ENABLED:
+            parts['prompts_all__p1'] = build_feed_page('all', '1')
+
+        content = JSONRenderer().render({
+            'categories':   parts['category_list'],
+            'prompts':      personalize_page(parts['prompts_all__p1'], request, device_id),
+            'ads':          parts['active_ads'],
+            'admob_config': parts['admob_config'],
+        })
+        etag = '"%s"' % hashlib.sha1(content).hexdigest()
+
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'   # har baar revalidate, body sirf badalne pe
+        return response
+
+
 # ===================== LIKE & FAVOURITE =====================
 
 class FavouriteListCreate(generics.ListCreateAPIView):
     serializer_class = PromptSerializer
     permission_classes = [AllowAny]
+    renderer_classes = COMPACT_RENDERER_CLASSES
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'favourite'
+    replica_reads = True
 
     def get_queryset(self):
-        device_id = self.request.query_params.get('device_id')
-        if not device_id:
+        device_pk = resolve_device(self.request.query_params.get('device_id'))
+        if not device_pk:
             return Prompt.objects.none()
         return Prompt.objects.filter(
-            favourite__device_id=device_id
-        ).select_related('category')
+            favourite__device_id=device_pk
+        ).select_related('category', 'image')
 
     def perform_create(self, serializer):
         device_id = self.request.data.get('device_id')
         prompt_id = self.request.data.get('prompt_id')
-        Favourite.objects.get_or_create(device_id=device_id, prompt_id=prompt_id)
+        Favourite.objects.get_or_create(
+            device_id=resolve_device(device_id, create=True), prompt_id=prompt_id
+        )
+        pin_to_primary(device_id)
 
 
 class FavouriteDelete(generics.DestroyAPIView):
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'favourite'
 
     def delete(self, request, *args, **kwargs):
         device_id = request.query_params.get('device_id')
         prompt_id = kwargs.get('pk')
         try:
-            fav = Favourite.objects.get(device_id=device_id, prompt_id=prompt_id)
+            fav = Favourite.objects.get(device_id=resolve_device(device_id), prompt_id=prompt_id)
             fav.delete()
+            pin_to_primary(device_id)
             return Response({"removed": True})
         except Favourite.DoesNotExist:
             return Response({"error": "Not in favourites"}, status=404)
@@ -216,6 +533,8 @@ class FavouriteDelete(generics.DestroyAPIView):
 
 class LikeToggle(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'like'
 
     def post(self, request, pk):
         device_id = request.data.get('device_id')
@@ -223,25 +542,29 @@ class LikeToggle(APIView):
             return Response({"error": "device_id required"}, status=400)
 
         prompt = get_object_or_404(Prompt, id=pk)
-        like, created = PromptLike.objects.get_or_create(
-            device_id=device_id, prompt=prompt
-        )
+        liked, like_count = write_queue.run(partial(_toggle_like, device_id, prompt))
+        metrics.record_like(liked)
+        analytics.record_like(prompt, liked)
+        pin_to_primary(device_id)
+        cache.delete(PROMPT_DETAIL_KEY.format(prompt.pk))   # like_count
 
-        if not created:
-            like.delete()
-            liked = False
-        else:
-            liked = True
+        # Category ke saare pages — background mein, like bursts ek pass mein
+        schedule_feed_invalidation([prompt.category.slug])
+
+        return Response({"liked": liked, "like_count": like_count})
 
-        like_count = prompt.likes.count()
-        Prompt.objects.filter(pk=prompt.pk).update(like_count=like_count)
 
-        # Invalidate all pages of this category
-        for i in range(1, 20):
-            cache.delete(f'prompts_{prompt.category.slug}__p{i}')
-            cache.delete(f'prompts_all__p{i}')
+def _toggle_like(device_id, prompt):
+    # write_queue ke writer thread pe, batch transaction ke andar chalta hai
+    like, created = PromptLike.objects.get_or_create(
+        device_id=resolve_device(device_id, create=True), prompt=prompt
+    )
+    if not created:
+        like.delete()
 
-        return Response({"liked": liked, "like_count": like_count})
+    like_count = prompt.likes.count()
+    Prompt.objects.filter(pk=prompt.pk).update(like_count=like_count)
+    return created, like_count
 
 
 # ===================== ADMIN ONLY APIs =====================
@@ -252,12 +575,17 @@ class PromptCreateView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
     parser_classes = [JSONParser, MultiPartParser, FormParser]
 
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        # Block nahi karte, sirf admin ko dikhate hain
+        response.data['possible_duplicates'] = self.duplicates
+        return response
+
     def perform_create(self, serializer):
         instance = serializer.save()
-        # Invalidate page 1 cache on new prompt
-        cache.delete(f'prompts_{instance.category.slug}__p1')
-        cache.delete('prompts_all__p1')
-        cache.delete('category_list')
+        self.duplicates = dedup.check_and_index([instance]).get(instance.pk, [])
+        # Baaki writes jaisa: category_list turant, feed pages commit ke baad background mein
+        invalidate_feed_caches([instance.category.slug])
 
 
 class PromptUpdateView(generics.UpdateAPIView):
@@ -268,9 +596,12 @@ class PromptUpdateView(generics.UpdateAPIView):
 
     def perform_update(self, serializer):
         instance = serializer.save()
-        for i in range(1, 20):
-            cache.delete(f'prompts_{instance.category.slug}__p{i}')
-            cache.delete(f'prompts_all__p{i}')
+        if 'prompt_text' in serializer.validated_data:
+            dedup.index_prompts([instance])
+        schedule_feed_invalidation([instance.category.slug])
+        cache.delete(PROMPT_DETAIL_KEY.format(instance.pk))
+        request_rebuild()
+        suggest.request_refresh()
 
 
 class PromptDeleteView(generics.DestroyAPIView):
@@ -278,12 +609,166 @@ class PromptDeleteView(generics.DestroyAPIView):
     permission_classes = [IsAuthenticated]
     lookup_field = 'pk'
 
+    @transaction.atomic
     def perform_destroy(self, instance):
-        for i in range(1, 20):
-            cache.delete(f'prompts_{instance.category.slug}__p{i}')
-            cache.delete(f'prompts_all__p{i}')
+        schedule_feed_invalidation([instance.category.slug])
         cache.delete('category_list')
+        cache.delete(PROMPT_DETAIL_KEY.format(instance.pk))
+        DeletionLog.objects.create(kind='prompt', object_id=instance.pk)
         instance.delete()
+        request_rebuild()
+        suggest.request_refresh()
+
+
+class PromptImageUploadView(APIView):
+    """Multipart `image` → WebP thumbnails + size/placeholder (prompts_app/images.py)."""
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request, pk):
+        prompt = get_object_or_404(Prompt.objects.select_related('category'), pk=pk)
+        upload = request.FILES.get('image')
+        if upload is None:
+            return Response({'error': 'image file required'}, status=status.HTTP_400_BAD_REQUEST)
+        if upload.size > settings.THUMBNAIL_MAX_UPLOAD:
+            return Response({'error': 'image too large'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            metadata = images.process_upload(prompt, upload.read())
+        except images.INVALID_IMAGE_ERRORS:
+            return Response({'error': 'not a valid image'}, status=status.HTTP_400_BAD_REQUEST)
+        invalidate_feed_caches([prompt.category.slug], [prompt.pk])
+        return Response({key: metadata[key] for key in ('width', 'height', 'placeholder', 'thumbnails')})
+
+
+# ===================== BULK ADMIN APIs =====================
+
+BULK_MAX_ITEMS = 500
+
+
+def invalidate_feed_caches(category_slugs, prompt_ids=()):
+    """category_list + prompts ki detail entries turant (ek delete_many); har
+    affected category ke feed pages + 'all' background queue pe."""
+    cache.delete_many(['category_list'] + [PROMPT_DETAIL_KEY.format(pk) for pk in prompt_ids])
+    schedule_feed_invalidation(category_slugs)
+    request_rebuild()
+    suggest.request_refresh()
+
+
+def _bulk_items(data, key=None):
+    items = data.get(key) if key and isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return None, Response({"error": "Expected a non-empty list"}, status=400)
+    if len(items) > BULK_MAX_ITEMS:
+        return None, Response({"error": f"Max {BULK_MAX_ITEMS} items per request"}, status=400)
+    return items, None
+
+
+class PromptBulkCreateView(APIView):
+    """POST [ {title, prompt_text, category, ...}, ... ]"""
+    permission_classes = [IsAuthenticated]
+    renderer_classes = COMPACT_RENDERER_CLASSES
+
+    def post(self, request):
+        items, error = _bulk_items(request.data)
+        if error:
+            return error
+
+        serializer = PromptSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=400)
+
+        with transaction.atomic():
+            prompts = Prompt.objects.bulk_create(
+                [Prompt(**item) for item in serializer.validated_data]
+            )
+            duplicates = dedup.check_and_index(prompts)
+        invalidate_feed_caches(p.category.slug for p in prompts)
+
+        return Response({
+            "success": True,
+            "created": len(prompts),
+            "ids": [str(p.id) for p in prompts],
+            "possible_duplicates": {str(pk): matches for pk, matches in duplicates.items()},
+        }, status=201)
+
+
+class PromptBulkUpdateView(APIView):
+    """POST/PATCH [ {id, ...changed fields}, ... ] — category move bhi isi se."""
+    permission_classes = [IsAuthenticated]
+    renderer_classes = COMPACT_RENDERER_CLASSES
+
+    def patch(self, request):
+        items, error = _bulk_items(request.data)
+        if error:
+            return error
+
+        serializer = PromptBulkUpdateSerializer(data=items, many=True, partial=True)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=400)
+
+        seen, duplicates = set(), []
+        for index, item in enumerate(serializer.validated_data):
+            if item['id'] in seen:
+                duplicates.append(index)
+            seen.add(item['id'])
+        if duplicates:
+            return Response({"error": "Duplicate ids in batch", "indexes": duplicates}, status=400)
+
+        changes = {item['id']: item for item in serializer.validated_data}
+        with transaction.atomic():
+            prompts = Prompt.objects.select_related('category').select_for_update().in_bulk(list(changes))
+            missing = [str(pk) for pk in changes if pk not in prompts]
+            if missing:
+                return Response({"error": "Prompts not found", "ids": missing}, status=404)
+
+            slugs, fields = set(), {'updated_at'}
+            now = timezone.now()
+            for pk, item in changes.items():
+                prompt = prompts[pk]
+                slugs.add(prompt.category.slug)          # purani category
+                for attr, value in item.items():
+                    if attr != 'id':
+                        setattr(prompt, attr, value)
+                        fields.add(attr)
+                prompt.updated_at = now                   # bulk_update auto_now nahi chalata
+                slugs.add(prompt.category.slug)          # nayi category (move)
+
+            Prompt.objects.bulk_update(prompts.values(), sorted(fields), batch_size=BULK_MAX_ITEMS)
+            if 'prompt_text' in fields:
+                dedup.index_prompts(prompts.values())
+        invalidate_feed_caches(slugs, prompts)
+
+        return Response({"success": True, "updated": len(prompts)})
+
+    post = patch
+
+
+class PromptBulkDeleteView(APIView):
+    """POST {"ids": [...]}"""
+    permission_classes = [IsAuthenticated]
+    renderer_classes = COMPACT_RENDERER_CLASSES
+
+    def post(self, request):
+        ids, error = _bulk_items(request.data, key='ids')
+        if error:
+            return error
+        ids_field = serializers.ListField(child=serializers.UUIDField())
+        try:
+            ids = ids_field.run_validation(ids)
+        except serializers.ValidationError as e:
+            return Response({"errors": e.detail}, status=400)
+
+        with transaction.atomic():
+            prompts = Prompt.objects.filter(pk__in=ids)
+            slugs = set(prompts.values_list('category__slug', flat=True))
+            deleted_ids = list(prompts.values_list('pk', flat=True))
+            DeletionLog.objects.bulk_create(
+                [DeletionLog(kind='prompt', object_id=pk) for pk in deleted_ids]
+            )
+            Prompt.objects.filter(pk__in=deleted_ids).delete()
+        invalidate_feed_caches(slugs, deleted_ids)
+
+        return Response({"success": True, "deleted": len(deleted_ids)})
 
 
 # ===================== CATEGORY ADMIN VIEWS =====================
@@ -296,6 +781,8 @@ class CategoryCreateView(generics.CreateAPIView):
     def perform_create(self, serializer):
         serializer.save()
         cache.delete('category_list')
+        request_rebuild()
+        suggest.request_refresh()
 
 
 class CategoryUpdateView(generics.UpdateAPIView):
@@ -307,6 +794,8 @@ class CategoryUpdateView(generics.UpdateAPIView):
     def perform_update(self, serializer):
         serializer.save()
         cache.delete('category_list')
+        request_rebuild()
+        suggest.request_refresh()
 
 
 class CategoryDeleteView(generics.DestroyAPIView):
@@ -314,30 +803,98 @@ class CategoryDeleteView(generics.DestroyAPIView):
     permission_classes = [IsAuthenticated]
     lookup_field = 'id'
 
+    @transaction.atomic
     def perform_destroy(self, instance):
         cache.delete('category_list')
+        # Cascade mein jaane wale prompts ke bhi tombstones
+        prompt_ids = list(instance.prompts.values_list('pk', flat=True))
+        DeletionLog.objects.bulk_create(
+            [DeletionLog(kind='prompt', object_id=pk) for pk in prompt_ids]
+            + [DeletionLog(kind='category', object_id=instance.pk)]
+        )
+        cache.delete_many([PROMPT_DETAIL_KEY.format(pk) for pk in prompt_ids])
         instance.delete()
+        request_rebuild()
+        suggest.request_refresh()
 
 
 # ===================== ADS =====================
 
 class ActiveAdsView(APIView):
     permission_classes = [AllowAny]
+    replica_reads = True
 
     def get(self, request):
         try:
-            ads = Ad.objects.filter(is_active=True)
-            active_ads = [ad for ad in ads if not ad.is_expired()]
-            banner = next((a for a in active_ads if a.ad_type == 'banner'), None)
-            video  = next((a for a in active_ads if a.ad_type == 'video'), None)
-            return Response({
-                'banner_ad': AdSerializer(banner).data if banner else None,
-                'video_ad':  AdSerializer(video).data  if video  else None,
-            })
+            return Response(get_or_build('active_ads', build_active_ads, CACHE_TTL, family='ads'))
         except Exception as e:
             return Response({'banner_ad': None, 'video_ad': None})
 
 
+def build_active_ads():
+    ads = Ad.objects.filter(is_active=True)
+    active_ads = [ad for ad in ads if not ad.is_expired()]
+    banner = next((a for a in active_ads if a.ad_type == 'banner'), None)
+    video  = next((a for a in active_ads if a.ad_type == 'video'), None)
+    return {
+        'banner_ad': AdSerializer(banner).data if banner else None,
+        'video_ad':  AdSerializer(video).data  if video  else None,
+    }
+
+
+AD_EVENTS_MAX_BATCH = 100
+AD_EVENT_MAX_COUNT = 50
+AD_EVENT_COLUMNS = {'impression': analytics.IMPRESSION, 'click': analytics.CLICK}
+
+
+class AdEventsView(APIView):
+    """
+    App se batched ad events: {"events": [{"ad_id", "type": "impression"|"click", "count"?}]}.
+    Sirf worker buffer mein jaate hain (prompts_app/analytics.py) — koi DB write nahi.
+    """
+    permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'ad_events'
+
+    def post(self, request):
+        items = request.data.get('events') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'events list required'}, status=400)
+        if len(items) > AD_EVENTS_MAX_BATCH:
+            return Response({'error': f'max {AD_EVENTS_MAX_BATCH} events per request'}, status=400)
+
+        events = []
+        for item in items:
+            if not isinstance(item, dict) or item.get('type') not in AD_EVENT_COLUMNS:
+                return Response({'error': 'each event needs ad_id and type (impression/click)'}, status=400)
+            try:
+                ad_id = uuid.UUID(str(item.get('ad_id')))
+                count = int(item.get('count', 1))
+            except (TypeError, ValueError):
+                return Response({'error': 'invalid ad_id or count'}, status=400)
+            events.append((ad_id, AD_EVENT_COLUMNS[item['type']], min(max(count, 1), AD_EVENT_MAX_COUNT)))
+
+        analytics.record_ad_events(events)
+        return Response({'accepted': len(events)}, status=202)
+
+
+class AdminAdStatsView(APIView):
+    """Per-ad impressions/clicks/CTR (daily rollups) — show_after_seconds / duration_days tune karne ke liye."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            return Response({'error': 'days must be an integer'}, status=400)
+        days = min(max(days, 1), STATS_MAX_DAYS)
+        stats = get_or_build(
+            f'admin_ad_stats:{days}', partial(analytics.build_ad_stats, days),
+            settings.ANALYTICS_STATS_TTL, family='admin_stats',
+        )
+        return Response({'days': days, **stats})
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def activate_banner_ad(request):
@@ -358,6 +915,8 @@ def _activate_ad(request, ad_type):
     with transaction.atomic():
         Ad.objects.filter(ad_type=ad_type, is_active=True).update(is_active=False)
         ad = serializer.save(ad_type=ad_type, is_active=True, created_at=timezone.now())
+    cache.delete('active_ads')
+    request_rebuild()
 
     return Response({
         "success": True,
@@ -375,6 +934,8 @@ def deactivate_ad(request):
 
     with transaction.atomic():
         count = Ad.objects.filter(ad_type=ad_type, is_active=True).update(is_active=False)
+    cache.delete('active_ads')
+    request_rebuild()
 
     msg = f"{ad_type.title()} ad deactivated" if count else f"No active {ad_type} ad found"
     return Response({"success": True, "message": msg})
@@ -399,6 +960,7 @@ def change_admin_credentials(request):
         user.username = username
         user.set_password(password)
         user.save()
+        bump_token_version(user.pk)
         return Response({"success": True, "message": "Admin credentials updated! Please login again."})
     except Exception:
         return Response({"error": "Failed to update credentials"}, status=500)
@@ -408,26 +970,53 @@ def change_admin_credentials(request):
 
 class AdmobConfigPublicView(APIView):
     permission_classes = [AllowAny]
+    replica_reads = True
 
     def get(self, request):
-        config = AdmobConfig.objects.filter(is_active=True).first()
-        if config:
-            return Response(AdmobConfigSerializer(config).data)
+        return Response(get_or_build('admob_config', build_admob_config, CACHE_TTL, family='admob_config'))
 
-        return Response({
-            "banner_android":             "ca-app-pub-3940256099942544/6300978111",
-            "banner_ios":                 "ca-app-pub-3940256099942544/2934735716",
-            "interstitial_android":       "ca-app-pub-3940256099942544/1033173712",
-            "interstitial_ios":           "ca-app-pub-3940256099942544/4411468910",
-            "rewarded_android":           "ca-app-pub-3940256099942544/5224354917",
-            "rewarded_ios":               "ca-app-pub-3940256099942544/1712485313",
-            "app_open_android":           "ca-app-pub-3940256099942544/3419835294",
-            "app_open_ios":               "ca-app-pub-3940256099942544/5662855255",
-            "rewarded_interstitial_android": "ca-app-pub-3940256099942544/5351527112",
-            "rewarded_interstitial_ios":  "ca-app-pub-3940256099942544/6978759865",
-            "native_android": "",
-            "native_ios": "",
-        })
+
+def build_admob_config():
+    config = AdmobConfig.objects.filter(is_active=True).first()
+    if config:
+        return AdmobConfigSerializer(config).data
+
+    return {
+        "banner_android":             "ca-app-pub-3940256099942544/6300978111",
+        "banner_ios":                 "ca-app-pub-3940256099942544/2934735716",
+        "interstitial_android":       "ca-app-pub-3940256099942544/1033173712",
+        "interstitial_ios":           "ca-app-pub-3940256099942544/4411468910",
+        "rewarded_android":           "ca-app-pub-3940256099942544/5224354917",
+        "rewarded_ios":               "ca-app-pub-3940256099942544/1712485313",
+        "app_open_android":           "ca-app-pub-3940256099942544/3419835294",
+        "app_open_ios":               "ca-app-pub-3940256099942544/5662855255",
+        "rewarded_interstitial_android": "ca-app-pub-3940256099942544/5351527112",
+        "rewarded_interstitial_ios":  "ca-app-pub-3940256099942544/6978759865",
+        "native_android": "",
+        "native_ios": "",
+    }
+
+
+# ===================== ADMIN STATS =====================
+
+STATS_MAX_DAYS = 90
+
+
+class AdminStatsView(APIView):
+    """Views/likes per day, category and top prompts — sirf rollup tables se (prompts_app/analytics.py)."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get('days', 7))
+        except ValueError:
+            return Response({'error': 'days must be an integer'}, status=400)
+        days = min(max(days, 1), STATS_MAX_DAYS)
+        stats = get_or_build(
+            f'admin_stats:{days}', partial(analytics.build_stats, days),
+            settings.ANALYTICS_STATS_TTL, family='admin_stats',
+        )
+        return Response({'days': days, **stats})
 
 
 class AdmobConfigAdminView(APIView):
@@ -482,6 +1071,8 @@ class AdmobConfigAdminView(APIView):
             saved = serializer.save()
             saved.is_active = want_active
             saved.save(update_fields=["is_active"])
+            transaction.on_commit(lambda: cache.delete('admob_config'))
+            request_rebuild()
             return Response({
                 "success": True,
                 "message": "AdMob settings saved successfully!",
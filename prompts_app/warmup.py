@@ -0,0 +1,97 @@
+# prompts_app/warmup.py - Deploy / worker-boot cache warmer
+#
+# Sabse hot keys (category_list, active_ads, admob_config aur har category +
+# "all" ke pehle K feed pages) thread pool mein render karke cache mein daalta
+# hai — taaki deploy / Redis flush ke baad pehle users ko cold misses na milein.
+#
+#   python manage.py warm_cache --pages 2
+#   CACHE_WARM_ON_BOOT=True  → gunicorn.conf.py ka post_worker_init hook
+#   CACHE_WARM_ON_WRITE=True → writes ke baad invalidated category ke pages
+#                              background queue pe dobara (views.refresh_feed_cache)
+
+import logging
+import math
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+
+from .cache_utils import warm
+from .models import Category, Prompt
+
+logger = logging.getLogger(__name__)
+
+
+def hot_keys(pages):
+    """Return {cache key: build callable} for the hottest keys."""
+    from .views import (
+        PromptPagination, build_active_ads, build_admob_config,
+        build_category_list, build_feed_page,
+    )
+
+    jobs = {
+        'category_list': build_category_list,
+        'active_ads': build_active_ads,
+        'admob_config': build_admob_config,
+    }
+
+    counts = [('all', Prompt.objects.count())] + list(
+        Category.objects.annotate(n=Count('prompts')).values_list('slug', 'n')
+    )
+    for slug, count in counts:
+        available = max(1, math.ceil(count / PromptPagination.page_size))
+        for page in range(1, min(pages, available) + 1):
+            jobs[f'prompts_{slug}__p{page}'] = partial(build_feed_page, slug, str(page))
+    return jobs
+
+
+def _warm_one(key, build, ttl, force):
+    try:
+        value = warm(key, build, ttl, force=force)
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    finally:
+        connections.close_all()   # pool thread ke apne connections
+
+
+def warm_feed(slug, pages):
+    """Re-render the first `pages` feed pages of one category (after a write invalidated them)."""
+    from .views import CACHE_TTL, build_feed_page
+
+    for page in range(1, pages + 1):
+        data = warm(f'prompts_{slug}__p{page}', partial(build_feed_page, slug, str(page)), CACHE_TTL, force=True)
+        if not data['next']:
+            break
+
+
+def warm_cache(pages=None, workers=None, force=False):
+    """Warm the hot key set; returns {'keys', 'bytes', 'seconds', 'failed'}."""
+    from .views import CACHE_TTL
+
+    pages = pages or settings.CACHE_WARM_PAGES
+    workers = workers or settings.CACHE_WARM_WORKERS
+    start = time.perf_counter()
+
+    jobs = hot_keys(pages)
+    total_bytes, failed = 0, []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cache-warm') as pool:
+        futures = {
+            pool.submit(_warm_one, key, build, CACHE_TTL, force): key
+            for key, build in jobs.items()
+        }
+        for future in as_completed(futures):
+            try:
+                total_bytes += future.result()
+            except Exception:
+                logger.exception('Cache warm failed for %s', futures[future])
+                failed.append(futures[future])
+
+    return {
+        'keys': len(jobs) - len(failed),
+        'bytes': total_bytes,
+        'seconds': time.perf_counter() - start,
+        'failed': failed,
+    }
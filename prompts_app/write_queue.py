@@ -0,0 +1,134 @@
+# prompts_app/write_queue.py - Single-writer queue for hot counter/like writes
+#
+# SQLite ek waqt mein ek hi writer allow karta hai. PromptDetail ke usage
+# increments aur LikeToggle ke writes har request mein apna chhota transaction
+# kholte the, aur load pe `database is locked` aata tha.
+#
+# DB_WRITE_QUEUE=True (SQLite mode ka default) pe yeh writes process ke ek
+# writer thread se hote hain, jo queue se WRITE_QUEUE_BATCH tak jobs utha ke
+# ek hi transaction mein likhta hai:
+#   - increment_usage(pk): fire-and-forget; batch mein same prompt ke
+#     increments ek UPDATE mein jud jaate hain
+#   - run(fn): fn ko writer pe chalao aur uska result wapas do (likes)
+# Workers ke beech contention WAL + busy_timeout (settings) sambhalte hain.
+# Queue off ho (Postgres) to sab kuch inline chalta hai.
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import connections, models, transaction
+
+logger = logging.getLogger(__name__)
+
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _enabled():
+    return getattr(settings, 'DB_WRITE_QUEUE', False)
+
+
+def _ensure_writer():
+    global _writer
+    if _writer is not None and _writer.is_alive():
+        return
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name='db-writer', daemon=True)
+            _writer.start()
+
+
+def increment_usage(prompt_pk):
+    if not _enabled():
+        _apply_usage(Counter([prompt_pk]))
+        return
+    _ensure_writer()
+    _queue.put(('usage', prompt_pk))
+
+
+def run(fn):
+    """Run `fn()` on the writer thread (inside its batch transaction) and return its result."""
+    if not _enabled():
+        with transaction.atomic():
+            return fn()
+    _ensure_writer()
+    future = Future()
+    _queue.put(('call', (fn, future)))
+    return future.result(timeout=settings.WRITE_QUEUE_TIMEOUT)
+
+
+def flush():
+    """Block until everything queued so far is written (tests / shutdown)."""
+    if _writer is not None and _writer.is_alive():
+        _queue.join()
+
+
+atexit.register(flush)
+
+
+# ===================== WRITER THREAD =====================
+
+def _apply_usage(counts):
+    from .models import Prompt
+
+    for pk, n in counts.items():
+        Prompt.objects.filter(pk=pk).update(usage_count=models.F('usage_count') + n)
+
+
+def _drain():
+    # Pehla job aane tak ruko, phir WRITE_QUEUE_LINGER tak aur jama karo
+    jobs = [_queue.get()]
+    deadline = time.monotonic() + settings.WRITE_QUEUE_LINGER
+    while len(jobs) < settings.WRITE_QUEUE_BATCH:
+        timeout = deadline - time.monotonic()
+        try:
+            jobs.append(_queue.get(timeout=timeout) if timeout > 0 else _queue.get_nowait())
+        except queue.Empty:
+            break
+    return jobs
+
+
+def _write_batch(jobs):
+    usage = Counter(payload for kind, payload in jobs if kind == 'usage')
+    calls = [payload for kind, payload in jobs if kind == 'call']
+
+    outcomes = []
+    with transaction.atomic():
+        for fn, future in calls:
+            try:
+                with transaction.atomic():   # savepoint: ek job fail ho to baaki bache rahein
+                    outcomes.append((future, fn(), None))
+            except Exception as exc:
+                outcomes.append((future, None, exc))
+        if usage:
+            _apply_usage(usage)
+
+    # Results commit ke baad hi — caller ko rolled-back write ka result na mile
+    for future, result, exc in outcomes:
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+
+def _writer_loop():
+    while True:
+        jobs = _drain()
+        try:
+            _write_batch(jobs)
+        except Exception as exc:
+            logger.exception('Write batch of %d jobs failed', len(jobs))
+            for kind, payload in jobs:
+                if kind == 'call' and not payload[1].done():
+                    payload[1].set_exception(exc)
+            connections['default'].close()   # toota connection agle batch mein naya khulega
+        finally:
+            for _ in jobs:
+                _queue.task_done()